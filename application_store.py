@@ -0,0 +1,387 @@
+import os
+import threading
+import uuid
+from bisect import bisect_left
+from itertools import islice
+from file_lock import FileLock
+from journal import OP_PUT, OP_DELETE
+from snapshot_cache import file_key
+from constants import HEADERS, ID_HEADER, WRITE_BEHIND_DELAY, GREEN, YELLOW, RED, CYAN, RESET
+
+def new_row_id():
+    return uuid.uuid4().hex
+
+def fit_row(row):
+    row = list(row)
+    return row[:len(HEADERS)] + [None] * (len(HEADERS) - len(row))
+
+def find_id_column(header):
+    # 1-based column headed ID_HEADER, or None; other extra columns belong to the user
+    for col_idx, value in enumerate(header, start=1):
+        if value == ID_HEADER:
+            return col_idx
+    return None
+
+def split_record(row, id_column=None):
+    row = list(row)
+    values = fit_row(row)
+    row_id = row[id_column - 1] if id_column is not None and len(row) >= id_column else None
+    return (str(row_id) if row_id not in (None, "") else None), values
+
+def column_indexes(columns):
+    # Maps header names to value positions; None keeps every column
+    return [HEADERS.index(col) for col in columns] if columns else None
+
+def project(values, indexes):
+    return tuple(values[i] for i in indexes) if indexes is not None else tuple(values)
+
+def iter_sheet_records(workbook_path):
+    # Streams (sheet row, id, values) in read-only mode, so the full cell graph is never built
+    import openpyxl
+    wb = openpyxl.load_workbook(workbook_path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        id_column = find_id_column(next(rows, ()))
+        for sheet_row, row in enumerate(rows, start=2):
+            if any(v is not None for v in row):
+                yield (sheet_row,) + split_record(row, id_column)
+    finally:
+        wb.close()
+
+def iter_workbook_records(workbook_path):
+    for _, row_id, values in iter_sheet_records(workbook_path):
+        yield row_id, values
+
+def iter_workbook_rows(workbook_path, offset=0, limit=None, columns=None):
+    indexes = column_indexes(columns)
+    stop = None if limit is None else offset + limit
+    for _, values in islice(iter_workbook_records(workbook_path), offset, stop):
+        yield project(values, indexes)
+
+def row_runs(rows):
+    # Groups sorted row numbers into [start, count] runs
+    runs = []
+    for row in rows:
+        if runs and runs[-1][0] + runs[-1][1] == row:
+            runs[-1][1] += 1
+        else:
+            runs.append([row, 1])
+    return runs
+
+def sync_sheet(ws, records, sheet_rows):
+    # Applies records to the sheet in place. Removed rows are deleted whole and new rows appended,
+    # so any extra columns the user keeps stay with their row. sheet_rows maps ids to sheet rows;
+    # the updated map is returned.
+    from openpyxl.utils import get_column_letter
+    id_column = find_id_column(cell.value for cell in ws[1])
+    if id_column is None:
+        id_column = ws.max_column + 1
+        ws.cell(row=1, column=id_column, value=ID_HEADER)
+    ws.column_dimensions[get_column_letter(id_column)].hidden = True
+    live = {row_id for row_id, _ in records}
+    gone = sorted(row for row_id, row in sheet_rows.items() if row_id not in live)
+    for start, count in reversed(row_runs(gone)):
+        ws.delete_rows(start, count)
+    positions = {}
+    next_row = ws.max_row + 1
+    for row_id, values in records:
+        row = sheet_rows.get(row_id)
+        if row is None:
+            row, next_row = next_row, next_row + 1
+        else:
+            row -= bisect_left(gone, row)
+        for col_idx, val in enumerate(values, start=1):
+            ws.cell(row=row, column=col_idx, value=val)
+        ws.cell(row=row, column=id_column, value=row_id)
+        positions[row_id] = row
+    return positions
+
+def write_workbook(workbook_path, records):
+    # Write-only mode streams rows to disk, so exports never hold the whole cell graph
+    import openpyxl
+    from openpyxl.utils import get_column_letter
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Applications")
+    ws.column_dimensions[get_column_letter(len(HEADERS) + 1)].hidden = True
+    ws.append(HEADERS + [ID_HEADER])
+    for row_id, values in records:
+        ws.append(list(values) + [row_id])
+    wb.save(workbook_path)
+
+class ApplicationStore:
+    # Loads the rows once; reads come from memory and changes are written back at most
+    # flush_delay seconds after the first unsaved one. With a journal every change is also
+    # fsync'd to it right away and replayed on the next load if the app dies before saving.
+    # The full workbook (with its cell graph) is only opened the first time something is saved.
+    # Loads and saves hold a lock file shared with other processes using the same workbook, and a
+    # save first merges in whatever another process saved since this one last read the file.
+    def __init__(self, path, flush_delay=WRITE_BEHIND_DELAY, on_synced=None, journal=None, on_reloaded=None):
+        self.path = path
+        self.flush_delay = flush_delay
+        if journal is not None and not journal.claim():
+            # Another process owns the journal and will fold it in itself; without one, save promptly
+            print(f"{YELLOW}{path} is open in another process; changes will be saved right away{RESET}")
+            journal = None
+            self.flush_delay = min(flush_delay, WRITE_BEHIND_DELAY)
+        self.journal = journal
+        # Called with the records whenever memory and the file on disk agree
+        self.on_synced = on_synced
+        # Called after rows saved by another process were merged in
+        self.on_reloaded = on_reloaded
+        self._file_lock = FileLock(f"{path}.lock")
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._wb = None
+        self._ws = None
+        # Deleted rows leave a None tombstone so positions of later rows never shift
+        self._rows = []
+        self._ids = []
+        self._positions = {}
+        # Sheet row of each id as of the last load or save
+        self._sheet_rows = {}
+        # File state as of the last load or save, and the changes made since
+        self._disk_key = None
+        self._pending = []
+        self._dirty = False
+        self._timer = None
+
+    def _read_workbook(self):
+        # Returns (file key, records, sheet rows, whether ids had to be assigned); the caller holds the file lock
+        key = file_key(self.path)
+        records, sheet_rows = [], {}
+        needs_ids = False
+        for sheet_row, row_id, values in iter_sheet_records(self.path):
+            if row_id is None or row_id in sheet_rows:
+                row_id = new_row_id()
+                needs_ids = True
+            records.append((row_id, values))
+            sheet_rows[row_id] = sheet_row
+        return key, records, sheet_rows, needs_ids
+
+    def _reset(self, key, records, sheet_rows):
+        self._rows = []
+        self._ids = []
+        self._positions = {}
+        for row_id, values in records:
+            self._add(row_id, values)
+        self._sheet_rows = sheet_rows
+        self._disk_key = key
+        self._wb = None
+        self._ws = None
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._file_lock:
+            key, records, sheet_rows, needs_ids = self._read_workbook()
+        self._reset(key, records, sheet_rows)
+        self._loaded = True
+        print(f"{CYAN}Loaded {len(self._positions)} applications into memory{RESET}")
+        replayed = self._replay_journal()
+        if needs_ids or replayed:
+            self._mark_dirty()
+        else:
+            self._synced()
+
+    def _synced(self):
+        if self.on_synced is not None:
+            self.on_synced(self._records())
+
+    def _replay_journal(self):
+        if self.journal is None:
+            return 0
+        entries = self.journal.entries()
+        self._apply_entries(entries)
+        self._pending.extend(entries)
+        if entries:
+            print(f"{YELLOW}Replayed {len(entries)} unsaved changes from {self.journal.path}{RESET}")
+        return len(entries)
+
+    def _apply_entries(self, entries):
+        for entry in entries:
+            row_id = entry.get("id")
+            if entry.get("op") == OP_PUT:
+                self._put(row_id, entry.get("values") or [])
+            elif entry.get("op") == OP_DELETE:
+                self._remove(row_id)
+
+    def _merge_from_disk(self):
+        # Another process saved the workbook since it was read: start from its rows and reapply ours
+        print(f"{YELLOW}{self.path} was saved by another process, merging its rows...{RESET}")
+        key, records, sheet_rows, _ = self._read_workbook()
+        self._reset(key, records, sheet_rows)
+        self._apply_entries(self._pending)
+        if self.on_reloaded is not None:
+            self.on_reloaded()
+
+    def _put(self, row_id, values):
+        if row_id in self._positions:
+            self._rows[self._positions[row_id]] = fit_row(values)
+        else:
+            self._add(row_id, values)
+
+    def _remove(self, row_id):
+        idx = self._positions.pop(row_id, None)
+        if idx is None:
+            return False
+        self._rows[idx] = None
+        if len(self._rows) > 64 and len(self._positions) < len(self._rows) // 2:
+            self._compact()
+        return True
+
+    def _log(self, entries):
+        # Write-ahead: the journal entry is durable before memory changes
+        if self.journal is not None:
+            self.journal.record(entries)
+        self._pending.extend(entries)
+
+    def _add(self, row_id, values):
+        self._positions[row_id] = len(self._rows)
+        self._rows.append(fit_row(values))
+        self._ids.append(row_id)
+
+    def _compact(self):
+        live = [(row_id, row) for row_id, row in zip(self._ids, self._rows) if row is not None]
+        self._rows = []
+        self._ids = []
+        self._positions = {}
+        for row_id, row in live:
+            self._add(row_id, row)
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _records(self):
+        return [(row_id, tuple(row)) for row_id, row in zip(self._ids, self._rows) if row is not None]
+
+    def records(self):
+        with self._lock:
+            self._ensure_loaded()
+            return self._records()
+
+    def iter_rows(self, offset=0, limit=None, columns=None):
+        with self._lock:
+            if not self._loaded and self.journal is not None and self.journal.pending():
+                # Changes not yet compacted into the workbook only exist in the journal
+                self._ensure_loaded()
+            if self._loaded:
+                indexes = column_indexes(columns)
+                live = (row for row in self._rows if row is not None)
+                stop = None if limit is None else offset + limit
+                page = [project(row, indexes) for row in islice(live, offset, stop)]
+            else:
+                page = None
+        if page is not None:
+            return iter(page)
+        # Nothing loaded and the journal is empty, so the file on disk is current
+        return iter_workbook_rows(self.path, offset, limit, columns)
+
+    def get(self, row_id):
+        with self._lock:
+            self._ensure_loaded()
+            idx = self._positions.get(row_id)
+            return tuple(self._rows[idx]) if idx is not None else None
+
+    def append(self, row_data, row_id=None):
+        return self.append_many([row_data], [row_id])[0]
+
+    def append_many(self, rows, row_ids=None):
+        if not rows:
+            return []
+        row_ids = [row_id or new_row_id() for row_id in (row_ids or [None] * len(rows))]
+        with self._lock:
+            self._ensure_loaded()
+            self._log([{"op": OP_PUT, "id": row_id, "values": fit_row(row_data)}
+                       for row_id, row_data in zip(row_ids, rows)])
+            for row_id, row_data in zip(row_ids, rows):
+                self._put(row_id, row_data)
+            self._mark_dirty()
+        return row_ids
+
+    def delete(self, row_id):
+        with self._lock:
+            self._ensure_loaded()
+            if row_id not in self._positions:
+                return False
+            self._log([{"op": OP_DELETE, "id": row_id}])
+            self._remove(row_id)
+            self._mark_dirty()
+        print("Successfully Deleted Row")
+        return True
+
+    def update(self, row_id, new_values):
+        with self._lock:
+            self._ensure_loaded()
+            if row_id not in self._positions:
+                return False
+            self._log([{"op": OP_PUT, "id": row_id, "values": fit_row(new_values)}])
+            self._put(row_id, new_values)
+            self._mark_dirty()
+        return True
+
+    def apply_changes(self, puts=(), deletes=()):
+        # One journal write and one save however many rows change; returns the ids that were deleted
+        with self._lock:
+            self._ensure_loaded()
+            deletes = [row_id for row_id in deletes if row_id in self._positions]
+            entries = [{"op": OP_PUT, "id": row_id, "values": fit_row(values)} for row_id, values in puts]
+            entries += [{"op": OP_DELETE, "id": row_id} for row_id in deletes]
+            if not entries:
+                return []
+            self._log(entries)
+            for row_id, values in puts:
+                self._put(row_id, values)
+            for row_id in deletes:
+                self._remove(row_id)
+            self._mark_dirty()
+        return deletes
+
+    def export_workbook(self, workbook_path):
+        write_workbook(workbook_path, self.records())
+        print(f"{GREEN}Exported applications to {workbook_path}{RESET}")
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            try:
+                with self._file_lock:
+                    if file_key(self.path) != self._disk_key:
+                        self._merge_from_disk()
+                    if self._wb is None:
+                        import openpyxl
+                        self._wb = openpyxl.load_workbook(self.path)
+                        self._ws = self._wb.active
+                    self._sheet_rows = sync_sheet(self._ws, self._records(), self._sheet_rows)
+                    # Saved beside the workbook and swapped in, so a crash mid-save leaves the old file intact
+                    root, ext = os.path.splitext(self.path)
+                    tmp_path = f"{root}.saving{ext}"
+                    self._wb.save(tmp_path)
+                    os.replace(tmp_path, self.path)
+                    self._disk_key = file_key(self.path)
+                if self.journal is not None:
+                    self.journal.clear()
+                self._pending = []
+                self._dirty = False
+                print(f"{GREEN}Saved changes to {self.path}{RESET}")
+                self._synced()
+            except OSError as e:
+                print(f"{RED}Failed to save workbook (will retry): {e}{RESET}")
+                self._mark_dirty()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.journal is not None:
+                self.journal.close()
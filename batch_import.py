@@ -0,0 +1,58 @@
+from job_parser import parse_job_info
+from task_queue import get_task_queue, LANE_PARSE
+from urls import normalize_url
+
+STATUS_QUEUED = "Queued"
+STATUS_PARSING = "Parsing"
+STATUS_DONE = "Done"
+STATUS_FAILED = "Failed"
+STATUS_DUPLICATE = "Duplicate"
+
+def parse_url_list(text):
+    urls = []
+    seen = set()
+    for line in text.splitlines():
+        url = line.strip()
+        if not url or url.startswith("#") or normalize_url(url) in seen:
+            continue
+        seen.add(normalize_url(url))
+        urls.append(url)
+    return urls
+
+def load_url_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_url_list(f.read())
+
+class BatchImporter:
+    # Status callbacks run on the Tk thread when the shared task queue is drained.
+    def __init__(self, on_status, parse_func=parse_job_info, tasks=None):
+        self.on_status = on_status
+        self.parse_func = parse_func
+        self.tasks = tasks or get_task_queue()
+        self._running = {}
+
+    @property
+    def in_flight(self):
+        return len(self._running)
+
+    def submit(self, url):
+        self.on_status(url, STATUS_QUEUED, None)
+        self._running[url] = self.tasks.submit(
+            LANE_PARSE, self.parse_func, url,
+            on_start=lambda: self.on_status(url, STATUS_PARSING, None),
+            on_done=lambda info: self._finish(url, info),
+            on_error=lambda e: self._finish(url, None),
+        )
+
+    def submit_all(self, urls):
+        for url in urls:
+            self.submit(url)
+
+    def _finish(self, url, info):
+        self._running.pop(url, None)
+        self.on_status(url, STATUS_DONE if info else STATUS_FAILED, info)
+
+    def shutdown(self):
+        for task in self._running.values():
+            task.cancel()
+        self._running.clear()
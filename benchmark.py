@@ -0,0 +1,291 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime, timedelta
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from constants import (HEADERS, SNAPSHOT_FILE, PARSE_CACHE_FILE, EXTRACTOR_PROFILES_FILE, PAGE_TIMINGS_FILE,
+                       BENCH_SIZES, BENCH_REPEAT, BENCH_OPS, BENCH_CORPUS_PAGES, BENCH_RESULTS_FILE,
+                       BENCH_THRESHOLD, BENCH_MIN_DELTA_MS, GREEN, YELLOW, RED, CYAN, RESET)
+from application_store import new_row_id, write_workbook
+from excel_handler import (use_excel_path, reset_store, init_excel, get_storage_backend, get_application_records,
+                           get_all_applications, save_to_excel, update_excel_row, delete_from_excel,
+                           search_applications, get_search_index, commit_changes)
+from search_index import SearchIndex
+from table_view import SortCache
+
+# Times the storage, search, sort and parsing hot paths on synthetic data and writes the results as JSON.
+# With --baseline it exits non-zero when a path got slower than the saved run allows.
+
+TITLES = ["Software Engineer", "Senior Data Scientist", "Product Manager", "DevOps Engineer",
+          "Frontend Developer", "Machine Learning Engineer", "QA Analyst", "Site Reliability Engineer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Wonka"]
+LOCATIONS = ["New York, NY", "Austin, TX", "Seattle, WA", "Remote", "Chicago, IL", "Denver, CO", "Boston, MA"]
+SEARCH_QUERIES = ["engineer", "acme data", "austin", "r-12", "no such posting"]
+
+# Config files the app writes while it runs; restored afterwards so a benchmark leaves no trace
+CONFIG_FILES = [SNAPSHOT_FILE, PARSE_CACHE_FILE, EXTRACTOR_PROFILES_FILE, PAGE_TIMINGS_FILE]
+
+PAGE_TEMPLATES = [
+    """<html><head><meta property="og:site_name" content="{company}"><title>{title}</title></head><body>
+<header><nav>Careers</nav></header>
+<div class="posting"><h1 class="posting-title">{title}</h1>
+<div class="meta"><span class="job-location">{location}</span></div>
+<p>Job ID <b class="req-code">{req}</b></p>{filler}</div></body></html>""",
+    """<html><head><meta property="og:site_name" content="{company}"></head><body>
+<main><section><h2 class="jobTitle">{title}</h2>
+<ul><li id="location">{location}</li><li>Requisition ID: {req}</li></ul>{filler}</section></main></body></html>""",
+    """<html><head><meta property="og:site_name" content="{company}"></head><body>
+<div id="app"><div class="header"><div class="job-title">{title}</div></div>
+<div class="details"><div>{location}</div><div><span>Job Number</span> <span>{req}</span></div></div>
+{filler}</div></body></html>""",
+]
+
+def synthetic_row(rng, index, start=date(2022, 1, 1)):
+    company = rng.choice(COMPANIES)
+    return [
+        (start + timedelta(days=rng.randrange(1100))).strftime('%Y-%m-%d'),
+        rng.choice(TITLES),
+        company,
+        rng.choice(LOCATIONS),
+        f"R-{rng.randrange(1, 100000)}",
+        f"https://jobs.{company.split()[0].lower()}.example/posting/{index}",
+    ]
+
+def generate_workbook(path, rows, seed=0):
+    rng = random.Random(seed)
+    write_workbook(path, [(new_row_id(), synthetic_row(rng, i)) for i in range(rows)])
+
+def generate_corpus(directory, pages, seed=0):
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(pages):
+        template = PAGE_TEMPLATES[i % len(PAGE_TEMPLATES)]
+        # Padding makes the pages closer to real postings in size
+        filler = "".join(f"<p>Responsibility {n}: build and ship things.</p>" for n in range(rng.randrange(20, 200)))
+        html = template.format(title=rng.choice(TITLES), company=rng.choice(COMPANIES),
+                               location=rng.choice(LOCATIONS), req=f"R-{rng.randrange(1, 100000)}", filler=filler)
+        (directory / f"posting_{i:03d}.html").write_text(html, encoding="utf-8")
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextmanager
+def serve_directory(directory):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, name="bench-http", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@contextmanager
+def preserve_files(paths):
+    saved = {path: path.read_bytes() if path.exists() else None for path in paths}
+    try:
+        yield
+    finally:
+        for path, data in saved.items():
+            if data is None:
+                if path.exists():
+                    path.unlink()
+            else:
+                path.write_bytes(data)
+
+def measure(func, repeat, setup=None, quiet=True):
+    # Wall-clock time of each run in seconds; setup runs before each one and is not timed
+    times = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull if quiet else sys.stdout):
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return times
+
+def summarize(times, **extra):
+    result = {
+        "runs": len(times),
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "mean_ms": round(statistics.mean(times) * 1000, 3),
+    }
+    result.update(extra)
+    return result
+
+def bench_storage(workdir, rows, repeat, ops, quiet):
+    results = {}
+    path = workdir / f"bench_{rows}.xlsx"
+    start = time.perf_counter()
+    generate_workbook(path, rows)
+    print(f"{CYAN}Generated {rows} rows in {time.perf_counter() - start:.1f}s{RESET}")
+    use_excel_path(path)
+    reset_store()
+    init_excel()
+    rng = random.Random(rows)
+
+    def consume():
+        deque(get_all_applications(), maxlen=0)
+
+    def consume_page():
+        deque(get_all_applications(rows // 2, 100, ["Company", "Job Title"]), maxlen=0)
+
+    # Until something loads the store, get_all_applications streams straight from the workbook
+    results["get_all_applications"] = summarize(measure(consume, repeat, setup=reset_store, quiet=quiet))
+    results["get_all_applications[page]"] = summarize(measure(consume_page, repeat, setup=reset_store, quiet=quiet))
+    results["load"] = summarize(measure(get_application_records, repeat, setup=reset_store, quiet=quiet))
+    results["get_all_applications[loaded]"] = summarize(measure(consume, repeat, quiet=quiet))
+
+    records = get_application_records()
+    results["search_index_build"] = summarize(measure(lambda: SearchIndex(records), repeat, quiet=quiet))
+    # The table filter goes through the search index; wait for its background build before timing the queries
+    get_search_index().ready.wait()
+    results["search_applications"] = summarize(
+        measure(lambda: [search_applications(q) for q in SEARCH_QUERIES], repeat, quiet=quiet),
+        queries=len(SEARCH_QUERIES))
+
+    # treeview_sort_column orders rows through SortCache: cold keys, then a direction flip on a warm cache
+    ids = [row_id for row_id, _ in records]
+    values = dict(records)
+    columns = range(len(HEADERS))
+    results["treeview_sort_column"] = summarize(measure(
+        lambda: [SortCache().order(ids, values, col, False) for col in columns], repeat, quiet=quiet),
+        columns=len(HEADERS))
+    cache = SortCache()
+    for col in columns:
+        cache.order(ids, values, col, False)
+    results["treeview_sort_column[flip]"] = summarize(measure(
+        lambda: [cache.order(ids, values, col, True) for col in columns], repeat, quiet=quiet),
+        columns=len(HEADERS))
+
+    saved = []
+    results["save_to_excel"] = summarize(measure(
+        lambda: saved.extend(save_to_excel(synthetic_row(rng, rows + len(saved))) for _ in range(ops)),
+        repeat, quiet=quiet), ops=ops)
+    results["update_excel_row"] = summarize(measure(
+        lambda: [update_excel_row(row_id, synthetic_row(rng, 0)) for row_id in rng.sample(ids, ops)],
+        repeat, quiet=quiet), ops=ops)
+    to_delete = iter(saved)
+    results["delete_from_excel"] = summarize(measure(
+        lambda: [delete_from_excel(next(to_delete)) for _ in range(ops)], repeat, quiet=quiet), ops=ops)
+    results["commit_changes"] = summarize(measure(
+        commit_changes, repeat, setup=lambda: update_excel_row(rng.choice(ids), synthetic_row(rng, 0)), quiet=quiet))
+    reset_store()
+    return results
+
+def bench_parsing(workdir, corpus, repeat, quiet):
+    from job_parser import parse_job_info, FIELDS
+    if corpus is None:
+        corpus = workdir / "corpus"
+        generate_corpus(corpus, BENCH_CORPUS_PAGES)
+    pages = sorted(p.name for p in Path(corpus).glob("*.htm*"))
+    if not pages:
+        print(f"{YELLOW}No .html files in {corpus}, skipping parse benchmark{RESET}")
+        return {}
+    with serve_directory(corpus) as base_url:
+        urls = [f"{base_url}/{name}" for name in pages]
+        found = []
+
+        def parse_all():
+            found.clear()
+            for url in urls:
+                info = parse_job_info(url, refresh=True) or {}
+                found.append(sum(info.get(field, "Unknown") != "Unknown" for field in FIELDS))
+
+        times = measure(parse_all, repeat, quiet=quiet)
+    # Fields found is tracked too, so a faster parser that finds less shows up in the results
+    return {"parse_job_info": summarize(times, pages=len(urls), fields_found=sum(found))}
+
+def compare(results, baseline, threshold, min_delta_ms):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        old, new = base["median_ms"], result["median_ms"]
+        change = (new - old) / old if old else 0.0
+        if new > old * (1 + threshold) and new - old > min_delta_ms:
+            regressions.append(name)
+            color = RED
+        else:
+            color = GREEN if change <= 0 else YELLOW
+        print(f"{color}{name}: {old:.1f} ms -> {new:.1f} ms ({change:+.0%}){RESET}")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the tracker's storage, search, sort and parsing paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES, help="workbook sizes in rows")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--ops", type=int, default=BENCH_OPS, help="rows saved, updated and deleted per run")
+    parser.add_argument("--corpus", help="folder of saved job-posting .html files (generated if omitted)")
+    parser.add_argument("--skip-parse", action="store_true", help="only run the storage benchmarks")
+    parser.add_argument("--output", default=BENCH_RESULTS_FILE, help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results file; exit 1 if a path got slower than allowed")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD, help="allowed slowdown, e.g. 0.25")
+    parser.add_argument("--workdir", help="keep generated workbooks and pages here instead of a temp folder")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own output while timing")
+    return parser
+
+def run(argv=None):
+    args = build_parser().parse_args(argv)
+    # Loaded first so a bad path fails before the slow runs
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, preserve_files(CONFIG_FILES):
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for rows in args.sizes:
+            print(f"{CYAN}Benchmarking {rows} rows...{RESET}")
+            for name, result in bench_storage(workdir, rows, args.repeat, args.ops, not args.verbose).items():
+                results[f"{rows}/{name}"] = result
+        if not args.skip_parse:
+            print(f"{CYAN}Benchmarking parse_job_info...{RESET}")
+            for name, result in bench_parsing(workdir, args.corpus, args.repeat, not args.verbose).items():
+                results[f"parse/{name}"] = result
+        from driver_pool import shutdown_driver_pool
+        shutdown_driver_pool()
+
+    for name, result in results.items():
+        print(f"{name}: median {result['median_ms']:.1f} ms (min {result['min_ms']:.1f} ms)")
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_backend": get_storage_backend(),
+        "repeat": args.repeat,
+        "ops": args.ops,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"{GREEN}Wrote results to {args.output}{RESET}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, BENCH_MIN_DELTA_MS)
+        if regressions:
+            print(f"{RED}{len(regressions)} benchmark(s) slower than the baseline allows: "
+                  f"{', '.join(regressions)}{RESET}")
+            return 1
+        print(f"{GREEN}No regressions over the baseline (threshold {args.threshold:.0%}){RESET}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run())
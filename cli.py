@@ -0,0 +1,131 @@
+import argparse
+import csv
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from constants import HEADERS, PARSE_MAX_WORKERS, GREEN, YELLOW, RED, CYAN, RESET
+from excel_handler import (use_excel_path, init_excel, close_store, make_row, find_duplicate_links,
+                           merge_many_to_excel, get_all_applications, export_applications)
+from application_store import new_row_id
+from batch_import import parse_url_list, load_url_file
+from driver_pool import shutdown_driver_pool
+from job_parser import parse_job_info
+from search_index import query_terms, row_matches
+
+# Headless entry point; must never import tkinter so it starts fast and runs without a display.
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Job application tracker (headless mode)")
+    parser.add_argument("--workbook", help="path to the tracker workbook (skips the saved config and disk search)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="parse and save one or more job URLs")
+    add.add_argument("urls", nargs="+")
+    import_cmd = commands.add_parser("import", help="parse and save every URL in a text file")
+    import_cmd.add_argument("file")
+    for cmd in (add, import_cmd):
+        cmd.add_argument("--workers", type=int, default=PARSE_MAX_WORKERS, help="pages parsed in parallel")
+        cmd.add_argument("--refresh", action="store_true", help="ignore cached parse results")
+        cmd.add_argument("--allow-duplicates", action="store_true", help="parse links that are already saved")
+
+    list_cmd = commands.add_parser("list", help="print saved applications")
+    list_cmd.add_argument("--offset", type=int, default=0)
+    list_cmd.add_argument("--limit", type=int)
+    search = commands.add_parser("search", help="print applications matching every word of a query")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int)
+    for cmd in (list_cmd, search):
+        cmd.add_argument("--columns", help="comma-separated column names, e.g. 'Company,Job Title'")
+        cmd.add_argument("--format", choices=["tsv", "csv"], default="tsv")
+
+    export = commands.add_parser("export", help="write all applications to a new workbook")
+    export.add_argument("path")
+    return parser
+
+def parse_columns(text):
+    if not text:
+        return None
+    columns = [col.strip() for col in text.split(",")]
+    unknown = [col for col in columns if col not in HEADERS]
+    if unknown:
+        raise SystemExit(f"Unknown column(s): {', '.join(unknown)}. Choose from: {', '.join(HEADERS)}")
+    return columns
+
+def write_rows(out, rows, columns, fmt):
+    writer = csv.writer(out, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+    writer.writerow(columns or HEADERS)
+    count = 0
+    # Rows are written as they arrive so large trackers start printing immediately
+    for row in rows:
+        writer.writerow(["" if val is None else val for val in row])
+        count += 1
+    return count
+
+def parse_and_save(urls, workers, refresh, allow_duplicates):
+    if not allow_duplicates:
+        duplicates = find_duplicate_links(urls)
+        for url in duplicates:
+            print(f"{YELLOW}Skipping {url}: already saved{RESET}")
+        urls = [url for url in urls if url not in duplicates]
+    rows = {}
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(parse_job_info, url, refresh): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                info = future.result()
+            except Exception as e:
+                info = None
+                print(f"{RED}Failed to parse {url}: {e}{RESET}")
+            if info:
+                rows[url] = make_row(info, url)
+                print(f"{CYAN}Parsed {url}: {info['Job Title']} at {info['Company']}{RESET}")
+            else:
+                failed += 1
+    # Keep the input order in the workbook
+    ordered = [rows[url] for url in urls if url in rows]
+    saved, merged = merge_many_to_excel(ordered, [new_row_id() for _ in ordered])
+    print(f"{GREEN}Saved {len(saved)} new applications, merged {len(merged)} duplicates, "
+          f"{failed} failed{RESET}")
+    return 1 if failed else 0
+
+def run(argv=None):
+    args = build_parser().parse_args(argv)
+    # Status messages go to stderr so list/search output can be piped
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        if args.workbook:
+            use_excel_path(args.workbook)
+        init_excel()
+        if args.command == "add":
+            return parse_and_save(parse_url_list("\n".join(args.urls)), args.workers, args.refresh,
+                                  args.allow_duplicates)
+        if args.command == "import":
+            return parse_and_save(load_url_file(args.file), args.workers, args.refresh, args.allow_duplicates)
+        if args.command == "list":
+            columns = parse_columns(args.columns)
+            rows = get_all_applications(args.offset, args.limit, columns)
+            count = write_rows(out, rows, columns, args.format)
+        elif args.command == "search":
+            columns = parse_columns(args.columns)
+            indexes = [HEADERS.index(col) for col in columns] if columns else None
+            # One pass over the rows, no index build, and it stops reading once --limit rows matched
+            terms = query_terms(" ".join(args.query))
+            matches = islice((values for values in get_all_applications() if row_matches(terms, values)), args.limit)
+            rows = ([values[i] for i in indexes] if indexes else values for values in matches)
+            count = write_rows(out, rows, columns, args.format)
+        elif args.command == "export":
+            export_applications(args.path)
+            return 0
+        out.flush()
+        print(f"{CYAN}{count} applications{RESET}")
+        return 0
+    finally:
+        close_store()
+        shutdown_driver_pool()
+        sys.stdout = out
+
+if __name__ == "__main__":
+    sys.exit(run())
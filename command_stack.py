@@ -0,0 +1,53 @@
+from collections import deque
+from constants import UNDO_LIMIT
+
+class Command:
+    # A user action as row states before and after it; None means the row does not exist.
+    def __init__(self, label, before, after):
+        self.label = label
+        self.before = before
+        self.after = after
+
+    @staticmethod
+    def changes(state):
+        puts = [(row_id, values) for row_id, values in state.items() if values is not None]
+        deletes = [row_id for row_id, values in state.items() if values is None]
+        return puts, deletes
+
+    def forward(self):
+        return self.changes(self.after)
+
+    def backward(self):
+        return self.changes(self.before)
+
+class CommandStack:
+    # Bounded undo history; doing something new clears the redo side
+    def __init__(self, limit=UNDO_LIMIT):
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+
+    def push(self, command):
+        self._undo.append(command)
+        self._redo.clear()
+
+    def undo(self):
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        self._redo.append(command)
+        return command
+
+    def redo(self):
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        self._undo.append(command)
+        return command
+
+    @property
+    def undo_label(self):
+        return self._undo[-1].label if self._undo else None
+
+    @property
+    def redo_label(self):
+        return self._redo[-1].label if self._redo else None
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 # Colors and styling
 PRIMARY_BG = "#2c3e50"
 SECONDARY_BG = "#34495e"
@@ -11,5 +13,97 @@ CYAN = "\033[96m"
 RESET = "\033[0m"
 
 # Excel configuration
+CONFIG_DIR = Path(__file__).parent / "config"
 EXCEL_FILE = "job_applications.xlsx"
 HEADERS = ["Date Applied", "Job Title", "Company", "Location", "Job/Req #", "Link"]
+ID_HEADER = "ID"  # hidden column (after any extra user columns) holding each row's stable ID
+
+# Browser pool configuration
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_PAGES = 25
+
+# Static HTML parsing
+STATIC_FETCH_TIMEOUT = 5
+STATIC_REQUIRED_FIELDS = ["Job Title", "Company"]
+STATIC_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Page readiness
+PAGE_READY_TIMEOUT = 15
+PAGE_READY_MIN_TIMEOUT = 3
+PAGE_READY_POLL = 0.1
+PAGE_STABLE_WINDOW = 0.5
+PAGE_TIMINGS_FILE = CONFIG_DIR / "page_timings.json"
+
+# Parse result cache
+PARSE_CACHE_FILE = CONFIG_DIR / "parse_cache.json"
+PARSE_CACHE_TTL = 14 * 24 * 3600  # seconds
+PARSE_CACHE_MAX_ENTRIES = 1000
+# Query params that only track where a click came from; dropped when normalizing URLs
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "trk", "trackingid",
+                   "refid", "ref", "referrer", "src", "source", "gh_src", "lever-source", "lever-origin"}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+# Extractor profiles
+EXTRACTOR_PROFILES_FILE = CONFIG_DIR / "extractor_profiles.json"
+PROFILE_MAX_SELECTORS = 3  # per domain and field
+PROFILE_CORRECTION_WEIGHT = 5  # a user's fix counts as this many successful parses
+PROFILE_DECAY = 0.9  # scores age on every parse so a site's markup change can be re-learned
+PROFILE_FAILURE_PENALTY = 0.5  # applied to a learned selector that missed or found an invalid value
+PROFILE_MIN_SCORE = 0.5  # selectors that fall below this are forgotten
+SELECTOR_MAX_DEPTH = 4
+# Profile hits longer than this are treated as a selector that landed on the wrong element
+PROFILE_VALUE_MAX_WORDS = 12
+REQ_MAX_WORDS = 4
+
+# Background tasks
+TASK_POLL_MS = 100
+PARSE_MAX_WORKERS = 4
+
+# Storage
+STORAGE_BACKEND = "excel"  # "excel" or "sqlite"
+SQLITE_FILE = "job_applications.db"
+WRITE_BEHIND_DELAY = 2.0
+SNAPSHOT_FILE = CONFIG_DIR / "table_snapshot.pickle"
+JOURNAL_COMPACT_INTERVAL = 30.0  # seconds between folding the journal into the workbook
+FILE_LOCK_POLL = 0.1  # seconds between tries while another process holds the workbook lock
+
+# In-app terminal
+LOG_FLUSH_MS = 100
+LOG_MAX_LINES = 2000
+LOG_FILE = None  # e.g. CONFIG_DIR / "job_tracker.log" to also keep the full log on disk
+LOG_FILE_MAX_BYTES = 1_000_000
+LOG_FILE_BACKUPS = 3
+
+# Undo history
+UNDO_LIMIT = 50
+
+# Benchmarks (benchmark.py)
+BENCH_SIZES = [1000, 10000, 100000]
+BENCH_REPEAT = 5
+BENCH_OPS = 100  # rows saved, updated and deleted per timed run
+BENCH_CORPUS_PAGES = 20
+BENCH_RESULTS_FILE = "benchmark_results.json"
+BENCH_THRESHOLD = 0.25  # allowed slowdown over the baseline median
+BENCH_MIN_DELTA_MS = 2.0  # smaller slowdowns are treated as noise
+
+# Table rendering
+VIRTUAL_ROW_THRESHOLD = 20000
+VIRTUAL_OVERSCAN = 10
+ROW_HEIGHT = 25
+
+# Search index
+SEARCH_BUILD_CHUNK = 2000  # rows indexed per lock hold while the index builds in the background
+
+# Workbook discovery
+DISCOVERY_MAX_DEPTH = 6
+DISCOVERY_TIME_BUDGET = 15
+DISCOVERY_WORKERS = 8
+DISCOVERY_PRIORITY_DIRS = ["Documents", "Desktop", "OneDrive/Documents", "OneDrive/Desktop", "Downloads"]
+DISCOVERY_SKIP_DIRS = {
+    "node_modules", "__pycache__", "site-packages", "dist-packages", "venv", "env", "build", "dist",
+    "target", "AppData", "Library", "Applications", "Pictures", "Music", "Movies", "Videos",
+    "snap", "go", "miniconda3", "anaconda3", "Windows", "Program Files", "Program Files (x86)",
+}
@@ -0,0 +1,138 @@
+import threading
+from contextlib import contextmanager
+from constants import DRIVER_POOL_SIZE, DRIVER_MAX_PAGES, GREEN, YELLOW, RED, CYAN, RESET
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+class DriverPool:
+    def __init__(self, max_size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _create_driver(self):
+        print(f"{CYAN}Starting headless browser to parse job info...{RESET}")
+        # Selenium is heavy to import, so it is only loaded once a browser is actually needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        return PooledDriver(webdriver.Chrome(options=options))
+
+    def _is_healthy(self, entry):
+        try:
+            entry.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, entry):
+        self._quit(entry)
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool has been shut down")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._created < self.max_size:
+                    self._created += 1
+                    entry = None
+                    break
+                self._cond.wait()
+
+        if entry is not None:
+            if self._is_healthy(entry):
+                return entry
+            print(f"{YELLOW}Pooled browser is unresponsive, replacing it.{RESET}")
+            self._quit(entry)
+
+        try:
+            return self._create_driver()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, entry, broken=False):
+        entry.pages += 1
+        if broken or self._closed or entry.pages >= self.max_pages:
+            if not broken and entry.pages >= self.max_pages:
+                print(f"{YELLOW}Recycling browser after {entry.pages} pages.{RESET}")
+            self._discard(entry)
+            return
+
+        try:
+            entry.driver.get("about:blank")
+        except Exception:
+            self._discard(entry)
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+        self._discard(entry)
+
+    @contextmanager
+    def driver(self):
+        from selenium.common.exceptions import WebDriverException
+        entry = self.acquire()
+        broken = False
+        try:
+            yield entry.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(entry, broken)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+        if idle:
+            print(f"{GREEN}Browser pool shut down ({len(idle)} browser(s) closed).{RESET}")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = DriverPool()
+        return _pool
+
+def shutdown_driver_pool():
+    global _pool
+    with _pool_lock:
+        pool = _pool
+        _pool = None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,75 @@
+from constants import HEADERS
+from urls import normalize_url
+
+LINK = HEADERS.index("Link")
+COMPANY = HEADERS.index("Company")
+REQ_ID = HEADERS.index("Job/Req #")
+MISSING = (None, "", "Unknown")
+
+def _is_missing(val):
+    return val in MISSING or (isinstance(val, str) and not val.strip())
+
+def link_key(url):
+    return None if _is_missing(url) else normalize_url(str(url))
+
+def req_key(values):
+    company, req_id = values[COMPANY], values[REQ_ID]
+    if _is_missing(company) or _is_missing(req_id):
+        return None
+    return str(company).strip().casefold(), str(req_id).strip().casefold()
+
+def merge_values(existing, new):
+    # Fills fields the existing row is missing; returns None when there is nothing to add
+    merged = list(existing)
+    changed = False
+    for i, val in enumerate(new):
+        if _is_missing(merged[i]) and not _is_missing(val):
+            merged[i] = val
+            changed = True
+    return merged if changed else None
+
+class DuplicateIndex:
+    # Maps normalized links and (company, req #) pairs to the rows that carry them.
+    def __init__(self, records=()):
+        self._links = {}
+        self._reqs = {}
+        self._keys = {}
+        for row_id, values in records:
+            self.add(row_id, values)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, row_id, values):
+        self.remove(row_id)
+        keys = (link_key(values[LINK]), req_key(values))
+        self._keys[row_id] = keys
+        # Dicts double as insertion-ordered sets so the oldest row is reported first
+        if keys[0]:
+            self._links.setdefault(keys[0], {})[row_id] = None
+        if keys[1]:
+            self._reqs.setdefault(keys[1], {})[row_id] = None
+
+    def update(self, row_id, values):
+        self.add(row_id, values)
+
+    def remove(self, row_id):
+        keys = self._keys.pop(row_id, None)
+        if keys is None:
+            return
+        for table, key in ((self._links, keys[0]), (self._reqs, keys[1])):
+            if key and key in table:
+                table[key].pop(row_id, None)
+                if not table[key]:
+                    del table[key]
+
+    def find_link(self, url):
+        ids = self._links.get(link_key(url))
+        return next(iter(ids)) if ids else None
+
+    def find(self, values):
+        row_id = self.find_link(values[LINK])
+        if row_id is None:
+            ids = self._reqs.get(req_key(values))
+            row_id = next(iter(ids)) if ids else None
+        return row_id
@@ -1,28 +1,34 @@
-import openpyxl
+import atexit
 import os
 import json
-from pathlib import Path
-from constants import EXCEL_FILE, HEADERS, GREEN, YELLOW, RED, CYAN, RESET
+import threading
+from datetime import datetime
+from application_store import ApplicationStore, fit_row, write_workbook
+from duplicate_index import DuplicateIndex, merge_values
+from file_discovery import SEARCH_INCOMPLETE, find_file
+from journal import MutationJournal, journal_path
+from search_index import SearchIndex, query_terms, row_matches
+from snapshot_cache import load_snapshot, save_snapshot, snapshot_matches
+from sqlite_store import SQLiteStore
+from constants import (CONFIG_DIR, EXCEL_FILE, SQLITE_FILE, STORAGE_BACKEND, LOG_FILE, JOURNAL_COMPACT_INTERVAL,
+                       GREEN, YELLOW, RED, CYAN, RESET)
 
-CONFIG_DIR = Path(__file__).parent / "config"
 CONFIG_FILE = CONFIG_DIR / "user_config.json"
 
-def find_file(filename, search_path=None):
-    print(f"{CYAN}Beginning File Search for {filename}{RESET}")
-    if search_path is None:
-        search_path = Path.home()
-    for root, dirs, files in os.walk(search_path):
-        if filename in files:
-            found_file = os.path.join(root, filename)
-            print(f"{GREEN}Found file: {found_file}{RESET}")
-            return found_file
-    print(f"{RED}File not found during disk search.{RESET}")
-    return None
+def _read_config():
+    try:
+        with open(CONFIG_FILE, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (json.JSONDecodeError, OSError):
+        return {}
 
 def save_config(excel_path):
     CONFIG_DIR.mkdir(exist_ok=True)
+    config = _read_config()
+    config["excel_path"] = excel_path
     with open(CONFIG_FILE, "w") as f:
-        json.dump({"excel_path": excel_path}, f)
+        json.dump(config, f)
     print(f"{GREEN}Successfully saved the excel file path to config file{RESET}")
 
 def load_config():
@@ -42,7 +48,7 @@ def load_config():
     print(f"{RED}Config file does not exist or can't be accessed.{RESET}")
     return None
 
-def get_excel_path():
+def resolve_excel_path():
     # Try loading from config first
     cached_path = load_config()
     if cached_path and os.path.exists(cached_path):
@@ -51,6 +57,11 @@ def get_excel_path():
 
     # Try to find the file on disk
     found_path = find_file(EXCEL_FILE)
+    if found_path is SEARCH_INCOMPLETE:
+        # The tracker may still exist somewhere unsearched, so the fallback is used for this run only
+        default_path = os.path.join(os.getcwd(), EXCEL_FILE)
+        print(f"{YELLOW}Search did not finish; using {default_path} for now without saving it to the config{RESET}")
+        return default_path
     if found_path:
         print(f"{GREEN}Loaded file from disk search: {found_path}{RESET}")
         save_config(found_path)
@@ -62,57 +73,269 @@ def get_excel_path():
     save_config(default_path)
     return default_path
 
-EXCEL_PATH = get_excel_path()
+_excel_path = None
+_excel_path_ready = threading.Event()
+_discovery_thread = None
+_discovery_lock = threading.Lock()
+
+def _discover_excel_path():
+    global _excel_path
+    try:
+        _excel_path = resolve_excel_path()
+    except Exception as e:
+        _excel_path = os.path.join(os.getcwd(), EXCEL_FILE)
+        print(f"{RED}Workbook discovery failed ({e}), using {_excel_path}{RESET}")
+    finally:
+        _excel_path_ready.set()
+
+def start_excel_discovery():
+    global _discovery_thread
+    with _discovery_lock:
+        if _discovery_thread is None and not _excel_path_ready.is_set():
+            _discovery_thread = threading.Thread(target=_discover_excel_path, name="excel-discovery", daemon=True)
+            _discovery_thread.start()
+
+def use_excel_path(path):
+    # Skips discovery and the saved config, e.g. for the CLI pointed at a shared tracker file
+    global _excel_path
+    with _discovery_lock:
+        _excel_path = os.path.abspath(path)
+        _excel_path_ready.set()
+
+def excel_path_ready():
+    return _excel_path_ready.is_set()
+
+def get_excel_path():
+    # Blocks until the background discovery has settled on a workbook
+    start_excel_discovery()
+    _excel_path_ready.wait()
+    return _excel_path
 
 def init_excel():
-    if not os.path.exists(EXCEL_PATH):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Applications"
-        ws.append(HEADERS)
-        wb.save(EXCEL_PATH)
-
-def save_to_excel(row_data):
-    wb = openpyxl.load_workbook(EXCEL_PATH)
-    ws = wb.active
-    ws.append(row_data)
-    wb.save(EXCEL_PATH)
-
-def delete_from_excel(values):
-    wb = openpyxl.load_workbook(EXCEL_PATH)
-    ws = wb.active
-
-    found = False
-    for idx, row in enumerate(ws.iter_rows(min_row=2), start=2):
-        def normalize(val):
-            return str(val).strip().replace('\n', '').replace('\r', '')
-
-        compare_values = [normalize(val) for val in values]
-        row_values = [normalize(cell.value) for cell in row]
-
-        compare_len = min(len(row_values), len(compare_values))
-        if row_values[:compare_len] == compare_values[:compare_len]:
-            ws.delete_rows(idx)
-            found = True
-            print("Successfully Deleted Row")
-            break
-
-    wb.save(EXCEL_PATH)
+    excel_path = get_excel_path()
+    if not os.path.exists(excel_path):
+        write_workbook(excel_path, [])
+
+def make_row(info, url):
+    today = datetime.today().strftime('%Y-%m-%d')
+    return [
+        today,
+        info["Job Title"],
+        info["Company"],
+        info["Location"],
+        info["Job/Req #"],
+        url,
+    ]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_storage_backend():
+    return _read_config().get("storage_backend", STORAGE_BACKEND)
+
+def get_log_file():
+    # "log_file" in the config turns on the rotating log file without editing constants
+    return _read_config().get("log_file", LOG_FILE)
+
+def get_sqlite_path():
+    return os.path.join(os.path.dirname(os.path.abspath(get_excel_path())), SQLITE_FILE)
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            if get_storage_backend() == "sqlite":
+                print(f"{CYAN}Using SQLite storage: {get_sqlite_path()}{RESET}")
+                _store = SQLiteStore(get_sqlite_path(), workbook_path=get_excel_path())
+            else:
+                excel_path = get_excel_path()
+                _store = ApplicationStore(excel_path, flush_delay=JOURNAL_COMPACT_INTERVAL,
+                                          on_synced=lambda records: save_snapshot(excel_path, records),
+                                          journal=MutationJournal(journal_path(excel_path)),
+                                          on_reloaded=_drop_indexes)
+            atexit.register(_store.close)
+        return _store
+
+def commit_changes():
+    get_store().flush()
+
+def close_store():
+    with _store_lock:
+        store = _store
+    if store is not None:
+        store.close()
+
+def reset_store():
+    # Saves and drops the store and its indexes so the next call reopens get_excel_path()
+    global _store, _search_index, _duplicate_index
+    close_store()
+    with _store_lock:
+        _store = _search_index = _duplicate_index = None
+
+_search_index = None
+
+def _drop_indexes():
+    # Rows saved by another process were merged into the store; rebuild the indexes on next use
+    global _search_index, _duplicate_index
+    with _store_lock:
+        _search_index = _duplicate_index = None
+
+def get_search_index():
+    # Returned right away; the rows are indexed on a background thread until index.ready is set
+    global _search_index
+    with _store_lock:
+        if _search_index is not None:
+            return _search_index
+        index = _search_index = SearchIndex()
+    threading.Thread(target=_build_search_index, args=(index,), name="search-index", daemon=True).start()
+    return index
+
+def _build_search_index(index):
+    index.build(get_store().records())
+    print(f"{CYAN}Built search index over {len(index)} applications{RESET}")
+
+_duplicate_index = None
+
+def get_duplicate_index():
+    global _duplicate_index
+    with _store_lock:
+        index = _duplicate_index
+    if index is None:
+        index = DuplicateIndex(get_store().records())
+        with _store_lock:
+            if _duplicate_index is None:
+                _duplicate_index = index
+            index = _duplicate_index
+    return index
+
+def _index_add(row_ids, rows):
+    for index in (_search_index, _duplicate_index):
+        if index is not None:
+            for row_id, row_data in zip(row_ids, rows):
+                index.add(row_id, fit_row(row_data))
+
+def save_to_excel(row_data, row_id=None):
+    row_id = get_store().append(row_data, row_id)
+    _index_add([row_id], [row_data])
+    return row_id
+
+def save_many_to_excel(rows, row_ids=None):
+    row_ids = get_store().append_many(rows, row_ids)
+    _index_add(row_ids, rows)
+    return row_ids
+
+def delete_from_excel(row_id):
+    found = get_store().delete(row_id)
+    if found:
+        for index in (_search_index, _duplicate_index):
+            if index is not None:
+                index.remove(row_id)
     return found
 
-def get_all_applications():
-    wb = openpyxl.load_workbook(EXCEL_PATH)
-    ws = wb.active
-    return [row for row in ws.iter_rows(min_row=2, values_only=True)]
-
-def update_excel_row(old_values, new_values):
-    wb = openpyxl.load_workbook(EXCEL_PATH)
-    ws = wb.active
-
-    for row in ws.iter_rows(min_row=2):
-        row_values = [cell.value if cell.value is not None else "" for cell in row]
-        if row_values == [v if v is not None else "" for v in old_values]:
-            for idx, val in enumerate(new_values):
-                row[idx].value = val
-            break
-    wb.save(EXCEL_PATH)
+def get_all_applications(offset=0, limit=None, columns=None):
+    # Yields row tuples lazily; columns is an optional list of header names to keep
+    return get_store().iter_rows(offset, limit, columns)
+
+def get_application_records():
+    return get_store().records()
+
+def load_table_snapshot():
+    # Last-known rows of the configured workbook, readable without opening the workbook
+    if get_storage_backend() != "excel":
+        return None
+    excel_path = _read_config().get("excel_path")
+    snapshot = load_snapshot()
+    if not excel_path or snapshot is None or snapshot["key"][0] != os.path.abspath(excel_path):
+        return None
+    return snapshot
+
+def validate_table_snapshot(snapshot):
+    # Returns fresh records if the workbook changed since the snapshot was taken, otherwise None
+    excel_path = get_excel_path()
+    # Unsaved journal entries mean the workbook alone is not the full picture
+    if snapshot_matches(snapshot, excel_path) and not MutationJournal(journal_path(excel_path)).pending():
+        print(f"{GREEN}Table snapshot is up to date{RESET}")
+        return None
+    print(f"{YELLOW}Workbook changed since the last run, reloading...{RESET}")
+    return get_application_records()
+
+def get_application(row_id):
+    return get_store().get(row_id)
+
+def search_applications(query):
+    index = get_search_index()
+    if index.ready.is_set():
+        return index.query(query)
+    # Still building, so answer this one with a plain scan
+    terms = query_terms(query)
+    return [(row_id, values) for row_id, values in get_store().records() if row_matches(terms, values)]
+
+def export_applications(workbook_path):
+    get_store().export_workbook(workbook_path)
+
+def update_excel_row(row_id, new_values):
+    updated = get_store().update(row_id, new_values)
+    if updated:
+        for index in (_search_index, _duplicate_index):
+            if index is not None:
+                index.update(row_id, fit_row(new_values))
+    return updated
+
+def apply_changes(puts=(), deletes=()):
+    # puts are (row_id, values) upserts; everything lands in a single store transaction
+    puts = [(row_id, fit_row(values)) for row_id, values in puts]
+    deleted = get_store().apply_changes(puts, deletes)
+    for index in (_search_index, _duplicate_index):
+        if index is not None:
+            for row_id, values in puts:
+                index.update(row_id, values)
+            for row_id in deleted:
+                index.remove(row_id)
+    if deleted or puts:
+        print(f"Saved {len(puts)} changed and {len(deleted)} deleted rows")
+    return deleted
+
+def _existing(row_id):
+    return (row_id, get_application(row_id)) if row_id is not None else None
+
+def find_duplicate_link(url):
+    # (row_id, values) of a saved row with the same normalized link, or None
+    return _existing(get_duplicate_index().find_link(url))
+
+def find_duplicate_links(urls):
+    index = get_duplicate_index()
+    found = {url: index.find_link(url) for url in urls}
+    return {url: _existing(row_id) for url, row_id in found.items() if row_id is not None}
+
+def find_duplicate(row_data):
+    # Matches on the normalized link first, then on (Company, Job/Req #)
+    return _existing(get_duplicate_index().find(fit_row(row_data)))
+
+def merge_many_to_excel(rows, row_ids):
+    # New rows are saved; duplicates only fill in fields the saved row is missing.
+    # Returns the saved ids and (row_id, existing_id, merged values or None) for each duplicate.
+    index = get_duplicate_index()
+    new_rows, new_ids, merged = [], [], []
+    for row_id, row_data in zip(row_ids, rows):
+        values = fit_row(row_data)
+        existing_id = index.find(values)
+        if existing_id is None:
+            new_rows.append(values)
+            new_ids.append(row_id)
+            index.add(row_id, values)
+            continue
+        existing = get_application(existing_id)
+        if existing is None:
+            # Saved earlier in this batch, so it is still waiting in new_rows
+            pending = new_rows[new_ids.index(existing_id)]
+            combined = merge_values(pending, values)
+            if combined is not None:
+                pending[:] = combined
+            merged.append((row_id, existing_id, combined))
+            continue
+        combined = merge_values(existing, values)
+        if combined is not None:
+            update_excel_row(existing_id, combined)
+        merged.append((row_id, existing_id, combined))
+    save_many_to_excel(new_rows, new_ids)
+    return new_ids, merged
@@ -0,0 +1,117 @@
+import json
+import threading
+from constants import (CONFIG_DIR, EXTRACTOR_PROFILES_FILE, PROFILE_MAX_SELECTORS, PROFILE_DECAY,
+                       PROFILE_FAILURE_PENALTY, PROFILE_MIN_SCORE, RED, RESET)
+
+# CSS selectors for common applicant tracking systems, matched on the end of the host name.
+# For <meta> elements the content attribute is used instead of the text.
+BUILTIN_PROFILES = {
+    "myworkdayjobs.com": {
+        "Job Title": ['[data-automation-id="jobPostingHeader"]'],
+        "Location": ['[data-automation-id="locations"] dd'],
+        "Job/Req #": ['[data-automation-id="requisitionId"] dd'],
+    },
+    "greenhouse.io": {
+        "Job Title": ["h1.app-title", ".job__title h1"],
+        "Company": [".company-name"],
+        "Location": ["div.location", ".job__location"],
+    },
+    "lever.co": {
+        "Job Title": [".posting-headline h2"],
+        "Location": [".posting-categories .location"],
+    },
+    "icims.com": {
+        "Job Title": ["h1.iCIMS_Header"],
+    },
+    "taleo.net": {
+        "Job Title": ['span[id*="reqTitle"]'],
+        "Location": ['span[id*="reqBasicLocation"]'],
+        "Job/Req #": ['span[id*="reqContestNumberValue"]'],
+    },
+}
+
+def builtin_profile(domain):
+    for suffix, profile in BUILTIN_PROFILES.items():
+        if domain == suffix or domain.endswith("." + suffix):
+            return profile
+    return {}
+
+class ExtractorProfiles:
+    # Learned selectors per domain and field, each with a score; higher scores are tried first.
+    def __init__(self, path=EXTRACTOR_PROFILES_FILE, max_selectors=PROFILE_MAX_SELECTORS):
+        self.path = path
+        self.max_selectors = max_selectors
+        self._lock = threading.Lock()
+        self._learned = None
+
+    def _load(self):
+        if self._learned is not None:
+            return
+        self._learned = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._learned = {
+                    domain: {field: {sel: float(score) for sel, score in selectors.items()}
+                             for field, selectors in fields.items()}
+                    for domain, fields in data.items()
+                }
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def _save(self):
+        try:
+            CONFIG_DIR.mkdir(exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self._learned, f, indent=2)
+        except OSError:
+            print(f"{RED}Failed to save extractor profiles.{RESET}")
+
+    def get(self, domain):
+        # {field: [selectors]}, learned ones first, then the built-in ATS profile
+        with self._lock:
+            self._load()
+            learned = self._learned.get(domain, {})
+            profile = {}
+            for field, selectors in learned.items():
+                profile[field] = sorted(selectors, key=selectors.get, reverse=True)
+        for field, selectors in builtin_profile(domain).items():
+            profile[field] = profile.get(field, []) + [s for s in selectors if s not in profile.get(field, [])]
+        return profile
+
+    def record(self, domain, sources, weight=1, failed=None):
+        # sources maps fields to the selector that found them and failed maps fields to learned
+        # selectors that were tried first but missed or gave an invalid value; saved once for all
+        if not sources and not failed:
+            return
+        with self._lock:
+            self._load()
+            learned = self._learned.setdefault(domain, {})
+            for field, tried in (failed or {}).items():
+                scores = learned.get(field, {})
+                for selector in tried:
+                    if selector in scores:
+                        scores[selector] *= PROFILE_FAILURE_PENALTY
+            for field, selector in sources.items():
+                scores = learned.setdefault(field, {})
+                for known in scores:
+                    scores[known] *= PROFILE_DECAY
+                # Make room before inserting, so a new selector is never the one evicted
+                while selector not in scores and len(scores) >= self.max_selectors:
+                    del scores[min(scores, key=scores.get)]
+                scores[selector] = scores.get(selector, 0) + weight
+            for field in set(sources) | set(failed or {}):
+                scores = learned.get(field, {})
+                for known in [s for s, score in scores.items() if score < PROFILE_MIN_SCORE]:
+                    del scores[known]
+            self._save()
+
+    def forget(self, domain, field, selector):
+        with self._lock:
+            self._load()
+            selectors = self._learned.get(domain, {}).get(field, {})
+            if selectors.pop(selector, None) is not None:
+                self._save()
+
+extractor_profiles = ExtractorProfiles()
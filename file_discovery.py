@@ -0,0 +1,82 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from pathlib import Path
+from constants import (DISCOVERY_MAX_DEPTH, DISCOVERY_PRIORITY_DIRS, DISCOVERY_SKIP_DIRS,
+                       DISCOVERY_TIME_BUDGET, DISCOVERY_WORKERS, GREEN, YELLOW, RED, CYAN, RESET)
+
+# Returned when the time or depth budget ran out first, which is not the same as "not on this disk"
+SEARCH_INCOMPLETE = object()
+
+def search_roots():
+    # Likely locations first; the home directory last so its children are scanned after them
+    home = Path.home()
+    roots = [Path.cwd()] + [home / name for name in DISCOVERY_PRIORITY_DIRS] + [home]
+    unique = []
+    for root in roots:
+        path = os.path.abspath(root)
+        if os.path.isdir(path) and path not in unique:
+            unique.append(path)
+    return unique
+
+def _skip_dir(name):
+    return name.startswith('.') or name.startswith('$') or name in DISCOVERY_SKIP_DIRS
+
+def _scan(path, filename):
+    found = None
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _skip_dir(entry.name):
+                            subdirs.append(entry.path)
+                    elif found is None and entry.name == filename:
+                        found = entry.path
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return found, subdirs
+
+def find_file(filename, roots=None, max_depth=DISCOVERY_MAX_DEPTH,
+              time_budget=DISCOVERY_TIME_BUDGET, workers=DISCOVERY_WORKERS):
+    print(f"{CYAN}Beginning File Search for {filename}{RESET}")
+    roots = search_roots() if roots is None else [os.path.abspath(root) for root in roots]
+    seen = set(roots)
+    frontier = list(roots)
+    deadline = time.monotonic() + time_budget
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-search")
+    try:
+        # Breadth-first, one directory level at a time, scanned in parallel
+        for depth in range(max_depth + 1):
+            if not frontier:
+                break
+            futures = [pool.submit(_scan, path, filename) for path in frontier]
+            next_frontier = []
+            for future in futures:
+                try:
+                    found, subdirs = future.result(timeout=max(0, deadline - time.monotonic()))
+                except TimeoutError:
+                    for pending in futures:
+                        pending.cancel()
+                    print(f"{YELLOW}File search stopped after {time_budget}s time budget.{RESET}")
+                    return SEARCH_INCOMPLETE
+                if found:
+                    for pending in futures:
+                        pending.cancel()
+                    print(f"{GREEN}Found file: {found}{RESET}")
+                    return found
+                for path in subdirs:
+                    if path not in seen:
+                        seen.add(path)
+                        next_frontier.append(path)
+            frontier = next_frontier
+    finally:
+        pool.shutdown(wait=False)
+    if frontier:
+        print(f"{YELLOW}File search stopped at depth {max_depth}.{RESET}")
+        return SEARCH_INCOMPLETE
+    print(f"{RED}File not found during disk search.{RESET}")
+    return None
@@ -1,20 +1,39 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import tkinter.font as tkFont
 import webbrowser
 import sys
-from datetime import datetime
 from constants import *
-from excel_handler import *
-from job_parser import parse_job_info
+from excel_handler import (get_excel_path, make_row, save_to_excel,
+                           get_application_records, search_applications,
+                           load_table_snapshot, validate_table_snapshot, find_duplicate_link,
+                           find_duplicate_links, find_duplicate, merge_many_to_excel, get_log_file,
+                           apply_changes)
+from application_store import new_row_id
+from job_parser import parse_job_info, learn_from_correction, FIELDS
+from batch_import import (BatchImporter, parse_url_list, load_url_file, STATUS_DONE, STATUS_FAILED,
+                          STATUS_DUPLICATE)
+from task_queue import get_task_queue, LANE_PARSE, LANE_IO
+from table_view import TableView, VirtualTableView, display_text
+from command_stack import Command, CommandStack
+from urls import normalize_url
+from log_sink import LogSink, DEBUG, INFO, WARNING, ERROR, LEVEL_NAMES
+from startup_timer import mark, report
+
+PENDING_INFO = {"Job Title": "Queued...", "Company": "", "Location": "", "Job/Req #": ""}
+LOG_FILTERS = {"All": DEBUG, "Info": INFO, "Warnings": WARNING, "Errors": ERROR}
+
+def rows_label(count):
+    return f"{count} row" if count == 1 else f"{count} rows"
 
 class StreamRedirector:
-    def __init__(self, write_callback):
-        self.write_callback = write_callback
+    # Safe to write from any thread; the sink is drained on the Tk thread
+    def __init__(self, sink, level=None):
+        self.sink = sink
+        self.level = level
 
     def write(self, message):
-        if message.strip():
-            self.write_callback(message)
+        self.sink.write(message, self.level)
 
     def flush(self):
         pass
@@ -22,12 +41,15 @@ class StreamRedirector:
 class JobTrackerGUI:
     def __init__(self, root):
         self.root = root
+        self.tasks = get_task_queue()
+        self.pending_items = {}
+        self.history = CommandStack()
+        self.log = LogSink(log_file=get_log_file())
+        self.log_level = DEBUG
         self.setup_gui()
-        sys.stdout = StreamRedirector(self.print_to_terminal)
-        sys.stderr = StreamRedirector(self.print_to_terminal)
-        self.last_deleted_row = None
-        self.last_edited_row = None
-        self.last_edited_item_id = None
+        sys.stdout = StreamRedirector(self.log)
+        sys.stderr = StreamRedirector(self.log, ERROR)
+        self.flush_terminal()
 
     def setup_gui(self):
         self.root.title("Job Tracker")
@@ -44,7 +66,7 @@ class JobTrackerGUI:
         self.style.configure("Treeview",
                             background="#ecf0f1",
                             foreground="black",
-                            rowheight=25,
+                            rowheight=ROW_HEIGHT,
                             fieldbackground="#ecf0f1")
         self.style.map("Treeview",
                       background=[('selected', '#3498db')],
@@ -57,7 +79,30 @@ class JobTrackerGUI:
         self.create_control_buttons_frame()
         self.create_info_frame()
         self.create_terminal_frame()
-        self.refresh_treeview()
+        # The first table load waits until the window is on screen
+        self.map_binding = self.root.bind("<Map>", self.on_first_map, add="+")
+
+    def on_first_map(self, event):
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>", self.map_binding)
+        mark("window mapped")
+        snapshot = load_table_snapshot()
+        if snapshot is None:
+            self.refresh_treeview()
+            return
+        # Paint last run's rows right away, then check the workbook in the background
+        self.populate_treeview(snapshot["records"])
+        self.tasks.submit(LANE_IO, validate_table_snapshot, snapshot, on_done=self.reconcile_snapshot)
+
+    def reconcile_snapshot(self, records):
+        if records is None:
+            return
+        query = self.search_var.get().strip()
+        if query:
+            self.refresh_treeview(query)
+        else:
+            self.populate_treeview(records)
 
     def create_terminal_frame(self):
         terminal_frame = tk.Frame(self.root, bg=PRIMARY_BG)
@@ -75,6 +120,9 @@ class JobTrackerGUI:
             wrap='word'
         )
         self.terminal_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.terminal_text.tag_configure("debug", foreground="#7fdbff")
+        self.terminal_text.tag_configure("warning", foreground="#f1c40f")
+        self.terminal_text.tag_configure("error", foreground="#ff6b6b")
 
         scrollbar = ttk.Scrollbar(terminal_frame, command=self.terminal_text.yview)
         scrollbar.pack(side=tk.LEFT, fill=tk.Y)
@@ -106,10 +154,25 @@ class JobTrackerGUI:
         )
         copy_btn.pack(pady=(0, 5))
 
+        self.log_filter_var = tk.StringVar(value="All")
+        log_filter = ttk.Combobox(btn_frame, textvariable=self.log_filter_var, values=list(LOG_FILTERS),
+                                  state='readonly', width=13)
+        log_filter.pack(pady=(0, 5))
+        log_filter.bind("<<ComboboxSelected>>", self.change_log_filter)
+
     def clear_terminal(self):
+        self.log.clear()
+        self.terminal_text.config(state='normal')
+        self.terminal_text.delete('1.0', tk.END)
+        self.terminal_text.config(state='disabled')
+
+    def change_log_filter(self, event=None):
+        self.log_level = LOG_FILTERS[self.log_filter_var.get()]
+        # Re-render the kept lines with the new filter
         self.terminal_text.config(state='normal')
         self.terminal_text.delete('1.0', tk.END)
         self.terminal_text.config(state='disabled')
+        self.append_terminal(list(self.log.lines))
 
     def copy_terminal(self):
         # Copy all terminal text to clipboard
@@ -118,16 +181,33 @@ class JobTrackerGUI:
         self.root.clipboard_append(terminal_content)
         print("Terminal content copied to clipboard")
 
-    def print_to_terminal(self, message):
-        if not hasattr(self, 'terminal_text'):
-            return
+    def print_to_terminal(self, message, level=None):
+        self.log.add(message, level)
+
+    def flush_terminal(self):
         try:
-            self.terminal_text.config(state='normal')
-            self.terminal_text.insert(tk.END, f"{message}\n")
-            self.terminal_text.see(tk.END)
-            self.terminal_text.config(state='disabled')
+            self.append_terminal(self.log.drain())
         except tk.TclError:
-            pass
+            return
+        self.root.after(LOG_FLUSH_MS, self.flush_terminal)
+
+    def append_terminal(self, entries):
+        # One insert per batch; the widget keeps at most LOG_MAX_LINES lines
+        chunks = []
+        for level, text in entries:
+            if level >= self.log_level:
+                chunks += [text + "\n", LEVEL_NAMES[level]]
+        if not chunks:
+            return
+        follow = self.terminal_text.yview()[1] >= 1.0
+        self.terminal_text.config(state='normal')
+        self.terminal_text.insert(tk.END, *chunks)
+        lines = int(self.terminal_text.index('end-1c').split('.')[0]) - 1
+        if lines > LOG_MAX_LINES:
+            self.terminal_text.delete('1.0', f"{lines - LOG_MAX_LINES + 1}.0")
+        self.terminal_text.config(state='disabled')
+        if follow:
+            self.terminal_text.see(tk.END)
 
     def create_url_entry_frame(self):
         frame_top = tk.Frame(self.root, bg=SECONDARY_BG)
@@ -140,6 +220,8 @@ class JobTrackerGUI:
         self.url_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         self.url_entry.bind("<Return>", lambda event: self.add_job_from_ui())
 
+        tk.Button(frame_top, text="Batch Import", bg=BUTTON_BG, fg=BUTTON_FG,
+                font=('Arial', 10, 'bold'), command=self.open_batch_import).pack(side=tk.RIGHT, padx=5)
         tk.Button(frame_top, text="Add Job", bg=BUTTON_BG, fg=BUTTON_FG,
                 font=('Arial', 10, 'bold'), command=self.add_job_from_ui).pack(side=tk.RIGHT, padx=5)
 
@@ -168,10 +250,11 @@ class JobTrackerGUI:
         tree_frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=(10, 5))
 
         self.tree = ttk.Treeview(tree_frame, columns=HEADERS, show='headings')
-        self.treeview_sort_column(self.tree, "Date Applied", True)
+        self.view = TableView(self.tree)
 
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscrollcommand=v_scrollbar.set)
+        self.v_scrollbar = v_scrollbar
 
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
         self.tree.configure(xscrollcommand=h_scrollbar.set)
@@ -186,9 +269,17 @@ class JobTrackerGUI:
         for col in HEADERS:
             self.tree.heading(col, text=col, command=lambda c=col: self.treeview_sort_column(self.tree, c, False))
             self.tree.column(col, anchor=tk.W, width=200)
+        # After the headings are set up, so the arrow and its toggle match the view's sort state
+        self.treeview_sort_column(self.tree, "Date Applied", True)
+
+        self.tree.tag_configure('uncommitted', foreground="#7f8c8d")
+        self.tree.tag_configure('pending', foreground="#d35400")
+        self.tree.tag_configure('saving', foreground="#2980b9")
 
         self.tree.bind("<Double-1>", lambda event: self.show_row_details())
         self.tree.bind("<Delete>", lambda event: self.remove_selected())
+        self.root.bind("<Control-z>", lambda event: self.undo())
+        self.root.bind("<Control-y>", lambda event: self.redo())
 
     def create_control_buttons_frame(self):
         main_btn_frame = tk.Frame(self.root, bg=PRIMARY_BG)
@@ -206,59 +297,41 @@ class JobTrackerGUI:
                  font=('Arial', 10, 'bold'), width=18,
                  command=self.edit_selected).pack(side=tk.LEFT, padx=5)
 
-        # Delete action buttons
-        delete_frame = tk.Frame(main_btn_frame, bg=PRIMARY_BG)
-        delete_frame.pack(fill=tk.X, pady=1)
+        # Undo / redo buttons
+        history_frame = tk.Frame(main_btn_frame, bg=PRIMARY_BG)
+        history_frame.pack(fill=tk.X, pady=1)
 
-        tk.Label(delete_frame, text="Delete Actions:", bg=PRIMARY_BG, fg=TEXT_COLOR,
+        tk.Label(history_frame, text="History:", bg=PRIMARY_BG, fg=TEXT_COLOR,
                 font=('Arial', 9, 'italic')).pack(side=tk.LEFT, padx=5)
 
-        self.undo_btn = tk.Button(delete_frame, text="Undo Delete", bg="#acae27", fg="white",
-                                font=('Arial', 9, 'bold'), width=15, state='disabled',
-                                command=self.undo_delete)
+        self.undo_btn = tk.Button(history_frame, text="Undo", bg="#acae27", fg="white",
+                                font=('Arial', 9, 'bold'), width=28, state='disabled',
+                                command=self.undo)
         self.undo_btn.pack(side=tk.LEFT, padx=5)
 
-        self.confirm_btn = tk.Button(delete_frame, text="Confirm Delete", bg="#e74c3c", fg="white",
-                                   font=('Arial', 9, 'bold'), width=15, state='disabled',
-                                   command=self.confirm_deletion)
-        self.confirm_btn.pack(side=tk.LEFT, padx=5)
-
-        # Edit action buttons
-        edit_frame = tk.Frame(main_btn_frame, bg=PRIMARY_BG)
-        edit_frame.pack(fill=tk.X, pady=1)
-
-        tk.Label(edit_frame, text="Edit Actions:", bg=PRIMARY_BG, fg=TEXT_COLOR,
-                font=('Arial', 9, 'italic')).pack(side=tk.LEFT, padx=5)
-
-        self.undo_edit_btn = tk.Button(edit_frame, text="Undo Edit", bg="#acae27", fg="white",
-                                     font=('Arial', 9, 'bold'), width=15, state='disabled',
-                                     command=self.undo_edit)
-        self.undo_edit_btn.pack(side=tk.LEFT, padx=5)
-
-        self.confirm_edit_btn = tk.Button(edit_frame, text="Confirm Edit", bg="#42e73c", fg="white",
-                                        font=('Arial', 9, 'bold'), width=15, state='disabled',
-                                        command=self.confirm_edit)
-        self.confirm_edit_btn.pack(side=tk.LEFT, padx=5)
+        self.redo_btn = tk.Button(history_frame, text="Redo", bg="#42e73c", fg="white",
+                                font=('Arial', 9, 'bold'), width=28, state='disabled',
+                                command=self.redo)
+        self.redo_btn.pack(side=tk.LEFT, padx=5)
 
     def create_info_frame(self):
         info_frame = tk.Frame(self.root, bg=PRIMARY_BG)
         info_frame.pack(pady=(0, 5), padx=10, fill=tk.X)
 
-        shortcuts_text = "• Double-click row for details • Delete key to remove • Enter to add/search"
+        shortcuts_text = ("• Double-click row for details • Ctrl/Shift-click to select several rows "
+                          "• Delete key to remove • Ctrl+Z / Ctrl+Y to undo/redo • Enter to add/search")
         tk.Label(info_frame, text=shortcuts_text, bg=PRIMARY_BG, fg="#95a5a6",
                 font=('Arial', 8), justify=tk.CENTER).pack()
 
+        self.workbook_var = tk.StringVar(value=f"Workbook: searching for {EXCEL_FILE}...")
+        tk.Label(info_frame, textvariable=self.workbook_var, bg=PRIMARY_BG, fg="#95a5a6",
+                font=('Arial', 8), justify=tk.CENTER).pack()
+        self.tasks.submit(LANE_IO, get_excel_path,
+                          on_done=lambda path: self.workbook_var.set(f"Workbook: {path}"))
+
     # Core functionality methods
     def treeview_sort_column(self, tree, col, reverse):
-        data = [(tree.set(item, col), item) for item in tree.get_children('')]
-
-        try:
-            data.sort(key=lambda t: float(t[0]), reverse=reverse)
-        except ValueError:
-            data.sort(reverse=reverse)
-
-        for index, (val, item) in enumerate(data):
-            tree.move(item, '', index)
+        self.view.sort(HEADERS.index(col), reverse)
 
         for c in tree['columns']:
             heading_text = tree.heading(c)['text']
@@ -277,74 +350,341 @@ class JobTrackerGUI:
             messagebox.showwarning("Input Error", "Please enter a job URL.")
             return
 
-        info = parse_job_info(url)
-        if not info:
-            return
-
-        today = datetime.today().strftime('%Y-%m-%d')
-        row_data = [
-            today,
-            info["Job Title"],
-            info["Company"],
-            info["Location"],
-            info["Job/Req #"],
-            url,
-        ]
-
-        save_to_excel(row_data)
-        self.tree.insert('', tk.END, values=row_data)
         self.url_entry.delete(0, tk.END)
-        self.refresh_treeview()
-        self.print_to_terminal("Successfully added new job row")
+        item_id = new_row_id()
+        self.view.insert(item_id, make_row(PENDING_INFO, url), tags=('pending',))
+
+        def on_link_checked(duplicate):
+            if duplicate and not self.confirm_duplicate(duplicate):
+                discard()
+                return
+            # A confirmed duplicate is not asked about again after parsing
+            start_parse(allow_duplicate=bool(duplicate))
+
+        def start_parse(allow_duplicate):
+            self.pending_items[item_id] = self.tasks.submit(
+                LANE_PARSE, parse_job_info, url, on_start=on_start,
+                on_done=lambda info: on_parsed(info, allow_duplicate), on_error=on_failed
+            )
+
+        def on_start():
+            self.view.update(item_id, make_row(dict(PENDING_INFO, **{"Job Title": "Parsing..."}), url))
+
+        def on_parsed(info, allow_duplicate):
+            if not info:
+                on_failed(None)
+                return
+            row_data = make_row(info, url)
+            self.view.update(item_id, row_data, tags=('saving',))
+            if allow_duplicate:
+                save(row_data)
+            else:
+                self.pending_items[item_id] = self.tasks.submit(
+                    LANE_IO, find_duplicate, row_data, on_done=lambda duplicate: on_row_checked(row_data, duplicate)
+                )
+
+        def on_row_checked(row_data, duplicate):
+            if duplicate and not self.confirm_duplicate(duplicate):
+                discard()
+                return
+            save(row_data)
+
+        def save(row_data):
+            self.pending_items[item_id] = self.tasks.submit(
+                LANE_IO, save_to_excel, row_data, item_id, on_done=on_saved
+            )
+
+        def discard():
+            self.pending_items.pop(item_id, None)
+            self.view.remove(item_id)
+            print(f"Skipped duplicate posting {url}")
+
+        def on_failed(error):
+            self.pending_items.pop(item_id, None)
+            self.view.remove(item_id)
+            self.print_to_terminal(f"Could not parse job info for {url}")
+
+        def on_saved(_):
+            self.pending_items.pop(item_id, None)
+            self.view.set_tags(item_id, ())
+            self.print_to_terminal("Successfully added new job row")
+
+        # Checked before any network or browser work starts
+        self.pending_items[item_id] = self.tasks.submit(LANE_IO, find_duplicate_link, url, on_done=on_link_checked)
+
+    def confirm_duplicate(self, duplicate):
+        row_id, values = duplicate
+        row = dict(zip(HEADERS, values))
+        self.view.see(row_id)
+        return messagebox.askyesno(
+            "Duplicate Posting",
+            f"'{row['Job Title']}' at {row['Company']} is already in your list "
+            f"(applied {row['Date Applied']}).\n\nAdd it again?"
+        )
+
+    def cancel_pending(self, item_id):
+        task = self.pending_items.get(item_id)
+        if task is None:
+            messagebox.showinfo("Pending Row", "This row belongs to an unsaved batch import.")
+            return
+        if task.lane == LANE_IO:
+            messagebox.showinfo("Pending Row", "This row is already being saved.")
+            return
+        task.cancel()
+        self.pending_items.pop(item_id)
+        # The row may be scrolled out of a virtual table, so read it from the view rather than the tree
+        values, _ = self.view.row_state(item_id)
+        url = values[HEADERS.index("Link")]
+        self.view.remove(item_id)
+        print(f"Cancelled parsing for {url}")
+
+    def open_batch_import(self):
+        batch_win = tk.Toplevel()
+        batch_win.title("Batch Import Jobs")
+        batch_win.geometry("800x560")
+        batch_win.configure(bg=PRIMARY_BG)
+
+        status_items = {}
+        parsed_rows = {}
+        tree_items = {}
+
+        tk.Label(batch_win, text="Paste job URLs (one per line):", bg=PRIMARY_BG, fg=TEXT_COLOR,
+                 font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=10, pady=(10, 0))
+
+        url_text = tk.Text(batch_win, height=8, font=('Arial', 10), bg=SECONDARY_BG, fg=TEXT_COLOR,
+                           insertbackground=TEXT_COLOR, relief='flat', wrap='none')
+        url_text.pack(fill=tk.X, padx=10, pady=5)
+
+        status_tree = ttk.Treeview(batch_win, columns=("Status", "URL"), show='headings', height=10)
+        status_tree.heading("Status", text="Status")
+        status_tree.heading("URL", text="URL")
+        status_tree.column("Status", width=100, anchor=tk.W, stretch=False)
+        status_tree.column("URL", width=640, anchor=tk.W)
+        status_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        summary_var = tk.StringVar(value="No URLs queued")
+        tk.Label(batch_win, textvariable=summary_var, bg=PRIMARY_BG, fg="#95a5a6",
+                 font=('Arial', 9)).pack(anchor=tk.W, padx=10)
+
+        btn_frame = tk.Frame(batch_win, bg=PRIMARY_BG)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        def update_summary():
+            statuses = [status_tree.set(item, "Status") for item in status_items.values()]
+            uncommitted = len(parsed_rows)
+            summary_var.set(
+                f"{len(statuses)} URLs • {statuses.count(STATUS_DONE)} parsed • "
+                f"{statuses.count(STATUS_FAILED)} failed • {statuses.count(STATUS_DUPLICATE)} already saved • "
+                f"{importer.in_flight} in progress • "
+                f"{uncommitted} waiting to be saved"
+            )
+            commit_btn.config(state='normal' if uncommitted and not importer.in_flight else 'disabled')
+            retry_btn.config(state='normal' if statuses.count(STATUS_FAILED) else 'disabled')
+
+        def on_status(url, status, info):
+            if not batch_win.winfo_exists():
+                return
+            status_tree.set(status_items[url], "Status", status)
+            if status == STATUS_DONE:
+                row_data = make_row(info, url)
+                parsed_rows[url] = row_data
+                tree_items[url] = new_row_id()
+                self.view.insert(tree_items[url], row_data, tags=('uncommitted',))
+                self.pending_items[tree_items[url]] = None
+                self.view.see(tree_items[url])
+            update_summary()
+
+        importer = BatchImporter(on_status)
+
+        def queue_urls(urls):
+            queued = {normalize_url(url) for url in status_items}
+            new_urls = [url for url in urls if normalize_url(url) not in queued]
+            for url in new_urls:
+                status_items[url] = status_tree.insert('', tk.END, values=("", url))
+
+            def on_checked(duplicates):
+                if not batch_win.winfo_exists():
+                    return
+                for url in duplicates:
+                    status_tree.set(status_items[url], "Status", STATUS_DUPLICATE)
+                # Links that are already saved are never parsed
+                importer.submit_all([url for url in new_urls if url not in duplicates])
+                update_summary()
+
+            self.tasks.submit(LANE_IO, find_duplicate_links, new_urls, on_done=on_checked)
+            update_summary()
+
+        def start_import():
+            urls = parse_url_list(url_text.get('1.0', tk.END))
+            if not urls:
+                messagebox.showwarning("Input Error", "Please paste at least one job URL.", parent=batch_win)
+                return
+            url_text.delete('1.0', tk.END)
+            queue_urls(urls)
+
+        def load_file():
+            path = filedialog.askopenfilename(parent=batch_win, title="Load URL List",
+                                              filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                queue_urls(load_url_file(path))
+            except OSError as e:
+                messagebox.showerror("Load Error", f"Could not read {path}: {e}", parent=batch_win)
+
+        def retry_failed():
+            failed = [url for url, item in status_items.items()
+                      if status_tree.set(item, "Status") == STATUS_FAILED]
+            importer.submit_all(failed)
+            update_summary()
+
+        def commit_rows():
+            rows = list(parsed_rows.values())
+            items = [tree_items.pop(url) for url in parsed_rows]
+            parsed_rows.clear()
+
+            def on_saved(result):
+                saved_ids, merged = result
+                for item in items:
+                    self.pending_items.pop(item, None)
+                for item in saved_ids:
+                    self.view.set_tags(item, ())
+                # Duplicates were folded into the row they match
+                for item, existing_id, values in merged:
+                    self.view.remove(item)
+                    if values is not None:
+                        self.view.update(existing_id, values)
+                print(f"Committed {len(saved_ids)} imported jobs to the workbook, "
+                      f"merged {len(merged)} duplicates into existing rows")
+
+            for item in items:
+                self.view.set_tags(item, ('saving',))
+            self.tasks.submit(LANE_IO, merge_many_to_excel, rows, items, on_done=on_saved)
+            if batch_win.winfo_exists():
+                update_summary()
+
+        def close_window():
+            if importer.in_flight and not messagebox.askyesno(
+                    "Batch Import", "URLs are still being parsed. Cancel them and close?", parent=batch_win):
+                return
+            importer.shutdown()
+            if parsed_rows:
+                if messagebox.askyesno("Batch Import",
+                                       f"Save {len(parsed_rows)} parsed jobs to the workbook?", parent=batch_win):
+                    commit_rows()
+                else:
+                    for url in list(parsed_rows):
+                        item = tree_items.pop(url)
+                        self.pending_items.pop(item, None)
+                        self.view.remove(item)
+                    parsed_rows.clear()
+            batch_win.destroy()
+
+        tk.Button(btn_frame, text="Start Import", bg=BUTTON_BG, fg=BUTTON_FG,
+                  font=('Arial', 10, 'bold'), command=start_import).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Load From File", bg=BUTTON_BG, fg=BUTTON_FG,
+                  font=('Arial', 10, 'bold'), command=load_file).pack(side=tk.LEFT, padx=5)
+        retry_btn = tk.Button(btn_frame, text="Retry Failed", bg="#acae27", fg="white",
+                              font=('Arial', 10, 'bold'), state='disabled', command=retry_failed)
+        retry_btn.pack(side=tk.LEFT, padx=5)
+        commit_btn = tk.Button(btn_frame, text="Save To Workbook", bg="#42e73c", fg="white",
+                               font=('Arial', 10, 'bold'), state='disabled', command=commit_rows)
+        commit_btn.pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Close", bg="#e74c3c", fg="white",
+                  font=('Arial', 10, 'bold'), command=close_window).pack(side=tk.RIGHT, padx=5)
+
+        batch_win.protocol("WM_DELETE_WINDOW", close_window)
+        url_text.focus_set()
+
+    def populate_treeview(self, records, filter_text=None):
+        if not filter_text:
+            self.set_view_mode(len(records) > VIRTUAL_ROW_THRESHOLD)
+        # Rows still being parsed or saved are kept, in sort order like the rest when a sort is active
+        self.view.show(records, complete=not filter_text, keep=list(self.pending_items))
+        report("first table fill")
 
     def refresh_treeview(self, filter_text=None):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        def populate(records):
+            self.populate_treeview(records, filter_text)
 
-        for row in get_all_applications():
-            row_vals = list(row)
-            if filter_text:
-                if not any(filter_text.lower() in str(cell).lower() for cell in row_vals):
-                    continue
-            self.tree.insert('', tk.END, values=row_vals)
-        self.root.update_idletasks()
+        if filter_text:
+            self.tasks.submit(LANE_IO, search_applications, filter_text, on_done=populate)
+        else:
+            self.tasks.submit(LANE_IO, get_application_records, on_done=populate)
+
+    def set_view_mode(self, virtual):
+        if self.view.virtual == virtual:
+            return
+        # Pending rows only live in the view, so carry them over
+        pending = [(row_id,) + self.view.row_state(row_id) for row_id in self.pending_items if row_id in self.view]
+        sort_state = self.view.sort_state
+        self.view.detach()
+        if virtual:
+            self.view = VirtualTableView(self.tree, self.v_scrollbar)
+            print(f"Large history detected, switching to virtualized table (>{VIRTUAL_ROW_THRESHOLD} rows)")
+        else:
+            self.view = TableView(self.tree)
+        self.view.sort_state = sort_state
+        for row_id, values, tags in pending:
+            self.view.insert(row_id, values, tags=tags)
 
     def remove_selected(self):
-        selected = self.tree.selection()
+        selected = self.view.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select a row to remove.")
             return
 
-        values = self.tree.item(selected[0], 'values')
-        self.last_deleted_row = values
-        self.tree.delete(selected[0])
+        # Rows still being parsed or saved are left alone
+        saved = [row_id for row_id in selected if row_id not in self.pending_items]
+        if not saved:
+            self.cancel_pending(selected[0])
+            return
+        if len(saved) > 1 and not messagebox.askyesno("Remove Jobs", f"Remove {len(saved)} selected jobs?"):
+            return
 
-        found = delete_from_excel(values)
-        if not found:
-            self.print_to_terminal("Full row not found in Excel for deletion.")
+        before = {row_id: self.view.row_state(row_id)[0] for row_id in saved}
+        self.execute(Command(f"Delete {rows_label(len(saved))}", before, dict.fromkeys(saved)))
 
-        self.undo_btn.config(state='normal')
-        self.confirm_btn.config(state='normal')
-        print("Row successfully deleted")
+    def execute(self, command):
+        self.history.push(command)
+        self.apply_row_changes(command.forward())
+        print(command.label)
 
-    def undo_delete(self):
-        if not self.last_deleted_row:
-            messagebox.showinfo("Undo Delete", "No deleted job to undo.")
+    def undo(self):
+        command = self.history.undo()
+        if command is None:
+            messagebox.showinfo("Undo", "Nothing to undo.")
             return
+        self.apply_row_changes(command.backward())
+        print(f"Undid: {command.label}")
 
-        save_to_excel(self.last_deleted_row)
-        self.tree.insert('', tk.END, values=self.last_deleted_row)
-
-        self.last_deleted_row = None
-        self.undo_btn.config(state='disabled')
-        self.confirm_btn.config(state='disabled')
-        print("Deletion successfully reverted")
+    def redo(self):
+        command = self.history.redo()
+        if command is None:
+            messagebox.showinfo("Redo", "Nothing to redo.")
+            return
+        self.apply_row_changes(command.forward())
+        print(f"Redid: {command.label}")
+
+    def apply_row_changes(self, changes):
+        # The table changes right away; the store gets the whole action as one transaction
+        puts, deletes = changes
+        for row_id in deletes:
+            self.view.remove(row_id)
+        for row_id, values in puts:
+            if row_id in self.view:
+                self.view.update(row_id, values)
+            else:
+                self.view.insert(row_id, values)
+        self.tasks.submit(LANE_IO, apply_changes, puts, deletes)
+        self.update_history_buttons()
 
-    def confirm_deletion(self):
-        self.last_deleted_row = None
-        self.undo_btn.config(state='disabled')
-        self.confirm_btn.config(state='disabled')
-        print("Entry successfully deleted")
+    def update_history_buttons(self):
+        undo_label, redo_label = self.history.undo_label, self.history.redo_label
+        self.undo_btn.config(text=f"Undo: {undo_label}" if undo_label else "Undo",
+                             state='normal' if undo_label else 'disabled')
+        self.redo_btn.config(text=f"Redo: {redo_label}" if redo_label else "Redo",
+                             state='normal' if redo_label else 'disabled')
 
     def show_row_details(self):
         selected = self.tree.selection()
@@ -406,13 +746,21 @@ class JobTrackerGUI:
                 text.grid(row=idx, column=1, sticky=tk.W, padx=10, pady=5)
 
     def edit_selected(self):
-        selected = self.tree.selection()
+        selected = self.view.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select a row to edit.")
             return
 
+        if any(row_id in self.pending_items for row_id in selected):
+            messagebox.showinfo("Pending Row", "Wait for the selected rows to finish saving before editing them.")
+            return
+        if len(selected) > 1:
+            self.bulk_edit(selected)
+            return
+
         item_id = selected[0]
-        values = list(self.tree.item(item_id, 'values'))
+        original = self.view.row_state(item_id)[0]
+        values = [display_text(val) for val in original]
 
         edit_win = tk.Toplevel()
         edit_win.title("Edit Job Entry")
@@ -428,14 +776,15 @@ class JobTrackerGUI:
                 new_val = entries[col].get().strip()
                 new_values.append(new_val if new_val else "Unknown")
 
-            self.last_edited_row = values.copy()
-            self.last_edited_item_id = item_id
+            self.execute(Command("Edit 1 row", {item_id: original}, {item_id: new_values}))
 
-            self.tree.item(item_id, values=new_values)
-            update_excel_row(values, new_values)
+            # Teach the parser where the corrected values live on this site
+            corrections = {field: new_values[HEADERS.index(field)] for field in FIELDS
+                           if new_values[HEADERS.index(field)] not in ("Unknown", values[HEADERS.index(field)])}
+            link = new_values[HEADERS.index("Link")]
+            if corrections and link != "Unknown":
+                self.tasks.submit(LANE_PARSE, learn_from_correction, link, corrections)
 
-            self.undo_edit_btn.config(state='normal')
-            self.confirm_edit_btn.config(state='normal')
             edit_win.destroy()
 
         for idx, col in enumerate(HEADERS):
@@ -474,26 +823,40 @@ class JobTrackerGUI:
 
         entries[HEADERS[0]].focus_set()
 
-    def undo_edit(self):
-        if not self.last_edited_row or not self.last_edited_item_id:
-            messagebox.showinfo("Undo Edit", "No edits to undo.")
-            return
+    def bulk_edit(self, selected):
+        edit_win = tk.Toplevel()
+        edit_win.title("Edit Selected Jobs")
+        edit_win.geometry("460x150")
+        edit_win.configure(bg=PRIMARY_BG)
+        edit_win.resizable(False, False)
+
+        tk.Label(edit_win, text=f"Set a field on {rows_label(len(selected))}", font=('Arial', 10, 'bold'),
+                 bg=PRIMARY_BG, fg=TEXT_COLOR).grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky=tk.W)
+        field_var = tk.StringVar(value="Company")
+        ttk.Combobox(edit_win, textvariable=field_var, values=HEADERS, state='readonly',
+                     width=15).grid(row=1, column=0, padx=10, pady=5)
+        value_entry = tk.Entry(edit_win, width=35, bg=SECONDARY_BG, fg=TEXT_COLOR, insertbackground=TEXT_COLOR,
+                               relief='flat', highlightthickness=1, highlightbackground=BUTTON_BG,
+                               highlightcolor=BUTTON_BG, font=('Arial', 10))
+        value_entry.grid(row=1, column=1, padx=10, pady=5)
+
+        def save_changes():
+            field = field_var.get()
+            col = HEADERS.index(field)
+            value = value_entry.get().strip() or "Unknown"
+            before, after = {}, {}
+            for row_id in selected:
+                values = tuple(self.view.row_state(row_id)[0])
+                if display_text(values[col]) != value:
+                    before[row_id] = values
+                    after[row_id] = values[:col] + (value,) + values[col + 1:]
+            edit_win.destroy()
+            if after:
+                self.execute(Command(f"Set {field} on {rows_label(len(after))}", before, after))
 
-        self.tree.item(self.last_edited_item_id, values=self.last_edited_row)
-        update_excel_row(self.tree.item(self.last_edited_item_id, 'values'), self.last_edited_row)
-
-        self.last_edited_row = None
-        self.last_edited_item_id = None
-        self.undo_edit_btn.config(state='disabled')
-        self.confirm_edit_btn.config(state='disabled')
-        print("Edit successfully undone")
-
-    def confirm_edit(self):
-        self.last_edited_row = None
-        self.last_edited_item_id = None
-        print("Edit successfully confirmed")
-        self.undo_edit_btn.config(state='disabled')
-        self.confirm_edit_btn.config(state='disabled')
+        tk.Button(edit_win, text="Save", bg=BUTTON_BG, fg=BUTTON_FG, font=('Arial', 10, 'bold'),
+                  command=save_changes).grid(row=2, column=0, columnspan=2, pady=10)
+        value_entry.focus_set()
 
     def do_search(self, event=None):
         query = self.search_var.get().strip()
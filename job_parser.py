@@ -1,112 +1,556 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-import time
-from constants import GREEN, YELLOW, RED, CYAN, RESET
+import re
+import threading
+from constants import (GREEN, YELLOW, RED, CYAN, RESET, STATIC_FETCH_TIMEOUT, STATIC_REQUIRED_FIELDS,
+                       STATIC_USER_AGENT, PROFILE_CORRECTION_WEIGHT, SELECTOR_MAX_DEPTH,
+                       PROFILE_VALUE_MAX_WORDS, REQ_MAX_WORDS)
+from driver_pool import get_driver_pool
+from extractor_profiles import extractor_profiles
+from page_readiness import wait_for_page_ready, get_domain
+from parse_cache import parse_cache
 
-def parse_job_info(url):
-    print("Starting headless browser to parse job info...")
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
+FIELDS = ["Job Title", "Company", "Location", "Job/Req #"]
+LOCATION_EXCLUDE = ['apply', 'requirements', 'responsibilities']
+REQ_ID_PHRASES = ['job id', 'job number', 'requisition id']
+OG_SITE_NAME = 'meta[property="og:site_name"]'
+# Attributes that usually name an element on purpose, preferred over classes when building selectors
+SELECTOR_ATTRS = ["data-automation-id", "data-testid", "data-qa", "itemprop"]
+_SELECTOR_TOKEN = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+_GENERATED_TOKEN = re.compile(r"[0-9]{3,}")
+_ATTR_VALUE = re.compile(r"^[A-Za-z0-9_ -]+$")
 
-    driver = webdriver.Chrome(options=options)
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": STATIC_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+            })
+            _session = session
+        return _session
+
+def parse_job_info(url, refresh=False):
+    # refresh=True skips the cached result for this URL and parses the page again
+    if refresh:
+        parse_cache.invalidate(url)
+    else:
+        cached = parse_cache.get(url)
+        if cached is not None:
+            return cached
+    domain = get_domain(url)
+    profile = extractor_profiles.get(domain)
+    info, sources = _parse_uncached(url, profile)
+    if info and any(info[field] != "Unknown" for field in FIELDS):
+        extractor_profiles.record(domain, sources, failed=_failed_selectors(profile, sources))
+        parse_cache.put(url, info, sources)
+    return info
+
+def _failed_selectors(profile, sources):
+    # Profile selectors are tried in order, so every one ranked above the selector that
+    # found a field either matched nothing or gave a value that failed the field checks
+    failed = {}
+    for field, selectors in profile.items():
+        winner = sources.get(field)
+        tried = selectors[:selectors.index(winner)] if winner in selectors else selectors
+        if tried:
+            failed[field] = tried
+    return failed
+
+def _parse_uncached(url, profile):
+    info, sources = parse_static(url, profile)
+    if info and all(info[field] != "Unknown" for field in STATIC_REQUIRED_FIELDS):
+        print(f"{GREEN}Parsed job info from static HTML, skipping browser.{RESET}")
+        return info, sources
 
     try:
-        print("Navigating to URL: ", url)
-        driver.get(url)
-        time.sleep(5)
-
-        # Job Title
-        job_title = "Unknown"
-        title_selectors = [
-            "//h1",
-            "//h2",
-            "//*[contains(@class, 'jobTitle')]",
-            "//*[contains(@class, 'job-title')]",
-            "//*[contains(@class, 'title')]",
-            "//*[contains(@id, 'jobTitle')]",
-            "//*[contains(@id, 'job-title')]",
-            "//div[contains(text(), 'Job Title')]/following-sibling::*[1]",
-        ]
-
-        for selector in title_selectors:
-            try:
-                elem = driver.find_element(By.XPATH, selector)
-                text = elem.text.strip()
-                if text:
-                    job_title = text
-                    print("Job title found: ", job_title)
-                    break
-            except:
-                continue
-        if job_title == "Unknown":
-            print("Job title not found with known selectors.")
+        with get_driver_pool().driver() as driver:
+            browser_info, browser_sources = _parse_with_driver(driver, url, profile)
+    except Exception as e:
+        print("Error parsing job info: ", e)
+        return info, sources
 
-        # Company
-        try:
-            company = driver.find_element(By.XPATH, "//meta[@property='og:site_name']").get_attribute("content").strip()
-            print("Company found: ", company)
-        except:
-            company = "Unknown"
-            print("Company not found from meta tag.")
-
-        # Location
-        location = "Unknown"
-        elements = driver.find_elements(By.XPATH,
-            "//*[contains(@class, 'location') or contains(@id, 'location') or contains(text(), 'United States') or contains(text(), 'Remote')]"
-        )
-
-        if not elements:
-            elements = driver.find_elements(By.XPATH, "//*[contains(text(), ',')]")
-
-        for el in elements:
-            text = el.text.strip()
-            if not text:
-                continue
-            if (
-                2 <= len(text.split()) <= 6 and
-                ',' in text and
-                not any(x in text.lower() for x in ['apply', 'requirements', 'responsibilities'])
-            ):
-                location = text
-                print("Location found: ", location)
+    if info:
+        for field in FIELDS:
+            if browser_info[field] == "Unknown":
+                browser_info[field] = info[field]
+                if field in sources:
+                    browser_sources[field] = sources[field]
+    return browser_info, browser_sources
+
+def learn_from_correction(url, corrections):
+    # corrections maps fields to the values the user typed in; the selectors that produced
+    # the wrong values are dropped and selectors that find the corrected ones are learned
+    domain = get_domain(url)
+    for field, selector in parse_cache.sources(url).items():
+        if field in corrections:
+            extractor_profiles.forget(domain, field, selector)
+    parse_cache.correct(url, corrections)
+    html = fetch_static_html(url)
+    if html is None:
+        return {}
+    soup = _soup(html)
+    learned = {}
+    for field, value in corrections.items():
+        selector = _learn_static(soup, value)
+        if selector:
+            learned[field] = selector
+    extractor_profiles.record(domain, learned, weight=PROFILE_CORRECTION_WEIGHT)
+    if learned:
+        print(f"{GREEN}Learned selectors for {domain}: {learned}{RESET}")
+    return learned
+
+def _is_location_text(text):
+    return (
+        2 <= len(text.split()) <= 6 and
+        ',' in text and
+        not any(x in text.lower() for x in LOCATION_EXCLUDE)
+    )
+
+def _req_from_text(full_text, elem_text):
+    new_text = full_text.split()
+    if len(new_text) >= 3 and len(full_text) > len(elem_text):
+        return new_text[2]
+    return None
+
+def _clean_value(field, text):
+    # Profile selectors for the req # may land on "Job ID: 123"; keep the last token
+    if field == "Job/Req #":
+        tokens = text.split()
+        return tokens[-1] if tokens else text
+    return text
+
+def _valid_profile_value(field, text):
+    # Selectors learned on one page of a site may land on unrelated text on another,
+    # so their hits get the same checks as the generic heuristics
+    words = text.split()
+    if field == "Location":
+        return _is_location_text(text)
+    if field == "Job/Req #":
+        return len(words) <= REQ_MAX_WORDS and any(c.isdigit() for c in words[-1])
+    return len(words) <= PROFILE_VALUE_MAX_WORDS
+
+def _from_profile(profile, select_text):
+    # The first selector with a valid value wins for each field; the rest fall through to the heuristics
+    values, sources = {}, {}
+    for field in FIELDS:
+        for selector in profile.get(field, []):
+            text = select_text(selector)
+            if text and _valid_profile_value(field, text):
+                values[field] = _clean_value(field, text)
+                sources[field] = selector
                 break
-        if location == "Unknown":
-            print("Location not confidently detected.")
+    return values, sources
+
+def _selector_token(token):
+    return bool(_SELECTOR_TOKEN.match(token)) and not _GENERATED_TOKEN.search(token)
 
-        # Job Requisition ID
-        job_req = "Unknown"
+# Static HTML tier
+def fetch_static_html(url):
+    import requests
+    try:
+        response = get_http_session().get(url, timeout=STATIC_FETCH_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"{YELLOW}Static fetch failed, falling back to browser: {e}{RESET}")
+        return None
+    content_type = response.headers.get("Content-Type", "")
+    if content_type and "html" not in content_type.lower():
+        print(f"{YELLOW}Static fetch returned {content_type}, falling back to browser.{RESET}")
+        return None
+    return response.text
+
+def parse_static(url, profile=None):
+    # Returns (info, sources) where sources maps fields to the selectors that found them
+    print(f"{CYAN}Fetching static HTML: {url}{RESET}")
+    html = fetch_static_html(url)
+    if html is None:
+        return None, {}
+    return extract_static(html, profile)
+
+def _own_text(tag):
+    text = tag.find(string=True, recursive=False)
+    return str(text) if text else ""
+
+def _tag_text(tag):
+    return tag.get_text(" ", strip=True)
+
+def _attr_contains(name, value):
+    def match(tag):
+        attr = tag.get(name)
+        if isinstance(attr, list):
+            attr = " ".join(attr)
+        return bool(attr) and value in attr
+    return match
+
+def _job_title_label_sibling(soup):
+    label = soup.find(lambda tag: tag.name == "div" and "Job Title" in _own_text(tag))
+    return label.find_next_sibling() if label else None
+
+def _soup(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    return soup
+
+def _select_text(soup, selector):
+    try:
+        elem = soup.select_one(selector)
+    except Exception:
+        return ""
+    if elem is None:
+        return ""
+    if elem.name == "meta":
+        return (elem.get("content") or "").strip()
+    return _tag_text(elem)
+
+def _selector_part(tag):
+    if tag.get("id") and _selector_token(tag["id"]):
+        return f"{tag.name}#{tag['id']}"
+    for attr in SELECTOR_ATTRS:
+        value = tag.get(attr)
+        if isinstance(value, str) and _ATTR_VALUE.match(value):
+            return f'{tag.name}[{attr}="{value}"]'
+    classes = [c for c in tag.get("class") or [] if _selector_token(c)][:3]
+    return tag.name + "".join("." + c for c in classes)
+
+def _css_selector(soup, elem):
+    # Shortest chain of ancestors (up to SELECTOR_MAX_DEPTH) whose first match is elem
+    parts = []
+    node = elem
+    for _ in range(SELECTOR_MAX_DEPTH):
+        if node is None or node.name in (None, "[document]", "html", "body"):
+            break
+        parts.insert(0, _selector_part(node))
+        selector = " > ".join(parts)
         try:
-            elems = driver.find_elements(
-                By.XPATH,
-                "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'job id') or "
-                "contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'job number') or "
-                "contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'requisition id')]"
-            )
-            for elem in elems:
-                parent = elem.find_element(By.XPATH, "..")
-                full_text = parent.text.strip()
-                new_text = full_text.split()
-                if len(new_text) >= 3:
-                    job_num = new_text[2]
-                    if len(full_text) > len(elem.text):
-                        job_req = job_num
-                        print("Job/Requisition # found: ", job_req)
-                        break
-        except:
-            print("Job/Requisition ID not found or parse failed.")
-
-        return {
-            "Job Title": job_title,
-            "Company": company,
-            "Location": location,
-            "Job/Req #": job_req
-        }
-    except Exception as e:
-        print("Error parsing job info: ", e)
+            if soup.select_one(selector) is elem:
+                return selector
+        except Exception:
+            return None
+        node = node.parent
+    return None
+
+def _learn_static(soup, value):
+    value = str(value).strip()
+    if not value:
         return None
-    finally:
-        driver.quit()
-        print("Browser session closed.")
+    if _select_text(soup, OG_SITE_NAME) == value:
+        return OG_SITE_NAME
+    node = soup.find(string=lambda s: s.strip() == value)
+    return _css_selector(soup, node.parent) if node is not None else None
+
+def parse_static_html(html, profile=None):
+    return extract_static(html, profile)[0]
+
+def extract_static(html, profile=None):
+    soup = _soup(html)
+    values, sources = _from_profile(profile or {}, lambda selector: _select_text(soup, selector))
+    missing = [field for field in FIELDS if field not in values]
+    if missing:
+        generic = _generic_static(soup, missing)
+        for field in missing:
+            value = generic[field]
+            if value == "Unknown":
+                continue
+            values[field] = value
+            # Remember where the generic cascade found it so next time one lookup is enough
+            selector = _learn_static(soup, value)
+            if selector:
+                sources[field] = selector
+    info = {field: values.get(field, "Unknown") for field in FIELDS}
+    print("Static parse result: ", info)
+    return info, sources
+
+def _generic_static(soup, fields):
+    # Job Title
+    job_title = "Unknown"
+    title_lookups = [
+        lambda: soup.find("h1"),
+        lambda: soup.find("h2"),
+        lambda: soup.find(_attr_contains("class", "jobTitle")),
+        lambda: soup.find(_attr_contains("class", "job-title")),
+        lambda: soup.find(_attr_contains("class", "title")),
+        lambda: soup.find(_attr_contains("id", "jobTitle")),
+        lambda: soup.find(_attr_contains("id", "job-title")),
+        lambda: _job_title_label_sibling(soup),
+    ]
+    for lookup in title_lookups if "Job Title" in fields else []:
+        elem = lookup()
+        text = _tag_text(elem) if elem else ""
+        if text:
+            job_title = text
+            break
+
+    # Company
+    company = _select_text(soup, OG_SITE_NAME) or "Unknown"
+
+    # Location
+    location = "Unknown"
+    elements = [] if "Location" not in fields else soup.find_all(lambda tag: (
+        _attr_contains("class", "location")(tag) or
+        _attr_contains("id", "location")(tag) or
+        "United States" in _own_text(tag) or
+        "Remote" in _own_text(tag)
+    ))
+    if not elements and "Location" in fields:
+        elements = soup.find_all(lambda tag: ',' in _own_text(tag))
+    for el in elements:
+        text = _tag_text(el)
+        if text and _is_location_text(text):
+            location = text
+            break
+
+    # Job Requisition ID
+    job_req = "Unknown"
+    elems = [] if "Job/Req #" not in fields else soup.find_all(
+        lambda tag: any(p in _own_text(tag).lower() for p in REQ_ID_PHRASES))
+    for elem in elems:
+        if elem.parent is None:
+            continue
+        job_num = _req_from_text(_tag_text(elem.parent), _tag_text(elem))
+        if job_num:
+            job_req = job_num
+            break
+
+    return {
+        "Job Title": job_title,
+        "Company": company,
+        "Location": location,
+        "Job/Req #": job_req
+    }
+
+# Browser tier
+TITLE_XPATHS = [
+    "//h1",
+    "//h2",
+    "//*[contains(@class, 'jobTitle')]",
+    "//*[contains(@class, 'job-title')]",
+    "//*[contains(@class, 'title')]",
+    "//*[contains(@id, 'jobTitle')]",
+    "//*[contains(@id, 'job-title')]",
+    "//div[contains(text(), 'Job Title')]/following-sibling::*[1]",
+]
+LOCATION_XPATHS = [
+    "//*[contains(@class, 'location') or contains(@id, 'location') or contains(text(), 'United States') or contains(text(), 'Remote')]",
+    "//*[contains(text(), ',')]",
+]
+REQ_ID_XPATH = "//*[" + " or ".join(
+    f"contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{phrase}')"
+    for phrase in REQ_ID_PHRASES
+) + "]"
+
+# Result keys used by the page scripts for each field
+SCRIPT_KEYS = {"Job Title": "title", "Company": "company", "Location": "location", "Job/Req #": "jobReq"}
+
+# Tries the domain profile's selectors first, then runs the rest of the cascade in the page,
+# so extraction costs one WebDriver round trip.
+EXTRACT_SCRIPT = """
+var titleXPaths = arguments[0], locationXPaths = arguments[1], reqXPath = arguments[2], excluded = arguments[3];
+var profile = arguments[4] || {};
+var maxWords = arguments[5], reqMaxWords = arguments[6];
+
+function snapshot(xpath) {
+    var nodes = [];
+    try {
+        var result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    } catch (e) {}
+    return nodes;
+}
+
+function visibleText(el) {
+    if (!el || !el.getClientRects || !el.getClientRects().length) return '';
+    return (el.innerText || '').trim();
+}
+
+function isLocation(text) {
+    var words = text.split(/\\s+/).filter(Boolean).length;
+    var lower = text.toLowerCase();
+    if (words < 2 || words > 6 || text.indexOf(',') === -1) return false;
+    for (var i = 0; i < excluded.length; i++) {
+        if (lower.indexOf(excluded[i]) !== -1) return false;
+    }
+    return true;
+}
+
+// Same checks as _valid_profile_value, so a selector that lands on the wrong element falls through
+function validProfileValue(key, text) {
+    var words = text.split(/\\s+/).filter(Boolean);
+    if (key === 'location') return isLocation(text);
+    if (key === 'jobReq') return words.length <= reqMaxWords && /[0-9]/.test(words[words.length - 1]);
+    return words.length <= maxWords;
+}
+
+function selectText(selector) {
+    var el = null;
+    try { el = document.querySelector(selector); } catch (e) {}
+    if (!el) return '';
+    if (el.tagName === 'META') return (el.getAttribute('content') || '').trim();
+    return visibleText(el);
+}
+
+var result = {title: null, company: null, location: null, jobReq: null};
+var sources = {};
+
+for (var key in result) {
+    var selectors = profile[key] || [];
+    for (var p = 0; p < selectors.length && result[key] === null; p++) {
+        var found = selectText(selectors[p]);
+        if (found && validProfileValue(key, found)) {
+            result[key] = found;
+            sources[key] = selectors[p];
+        }
+    }
+}
+result.sources = sources;
+
+for (var i = 0; i < titleXPaths.length && result.title === null; i++) {
+    var text = visibleText(snapshot(titleXPaths[i])[0]);
+    if (text) result.title = text;
+}
+
+var meta = document.querySelector('meta[property="og:site_name"]');
+if (result.company === null && meta && meta.hasAttribute('content')) result.company = meta.getAttribute('content').trim();
+
+var candidates = result.location === null ? snapshot(locationXPaths[0]) : [];
+if (!candidates.length && result.location === null) candidates = snapshot(locationXPaths[1]);
+for (var j = 0; j < candidates.length; j++) {
+    var locText = visibleText(candidates[j]);
+    if (locText && isLocation(locText)) {
+        result.location = locText;
+        break;
+    }
+}
+
+var reqElems = result.jobReq === null ? snapshot(reqXPath) : [];
+for (var k = 0; k < reqElems.length; k++) {
+    var fullText = visibleText(reqElems[k].parentNode);
+    var tokens = fullText.split(/\\s+/).filter(Boolean);
+    if (tokens.length >= 3 && fullText.length > visibleText(reqElems[k]).length) {
+        result.jobReq = tokens[2];
+        break;
+    }
+}
+
+return result;
+"""
+
+# Builds the same kind of selector as _css_selector for the element holding each value.
+LEARN_SCRIPT = """
+var values = arguments[0], attrs = arguments[1], maxDepth = arguments[2];
+
+function token(t) { return /^[A-Za-z_][A-Za-z0-9_-]*$/.test(t) && !/[0-9]{3,}/.test(t); }
+
+function part(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.id && token(el.id)) return tag + '#' + el.id;
+    for (var i = 0; i < attrs.length; i++) {
+        var v = el.getAttribute(attrs[i]);
+        if (v && /^[A-Za-z0-9_ -]+$/.test(v)) return tag + '[' + attrs[i] + '="' + v + '"]';
+    }
+    var classes = Array.prototype.filter.call(el.classList, token).slice(0, 3);
+    return tag + classes.map(function (c) { return '.' + c; }).join('');
+}
+
+function cssSelector(el) {
+    var parts = [], node = el;
+    for (var d = 0; d < maxDepth && node && node.nodeType === 1; d++) {
+        var tag = node.tagName.toLowerCase();
+        if (tag === 'html' || tag === 'body') break;
+        parts.unshift(part(node));
+        var selector = parts.join(' > ');
+        try { if (document.querySelector(selector) === el) return selector; } catch (e) { return null; }
+        node = node.parentElement;
+    }
+    return null;
+}
+
+function elementWithText(value) {
+    var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        var parent = walker.currentNode.parentElement;
+        if (walker.currentNode.nodeValue.trim() === value && parent && parent.getClientRects().length) return parent;
+    }
+    return null;
+}
+
+var meta = document.querySelector('meta[property="og:site_name"]');
+var siteName = meta ? (meta.getAttribute('content') || '').trim() : null;
+var learned = {};
+for (var key in values) {
+    if (siteName !== null && values[key] === siteName) {
+        learned[key] = 'meta[property="og:site_name"]';
+        continue;
+    }
+    var el = elementWithText(values[key]);
+    learned[key] = el ? cssSelector(el) : null;
+}
+return learned;
+"""
+
+def _parse_with_driver(driver, url, profile=None):
+    # Returns (info, sources) like parse_static
+    print("Navigating to URL: ", url)
+    driver.get(url)
+    wait_for_page_ready(driver, url, TITLE_XPATHS)
+
+    script_profile = {SCRIPT_KEYS[field]: selectors for field, selectors in (profile or {}).items()}
+    result = driver.execute_script(
+        EXTRACT_SCRIPT, TITLE_XPATHS, LOCATION_XPATHS, REQ_ID_XPATH, LOCATION_EXCLUDE, script_profile,
+        PROFILE_VALUE_MAX_WORDS, REQ_MAX_WORDS
+    ) or {}
+    found = result.get("sources") or {}
+    if result.get("jobReq") and "jobReq" in found:
+        result["jobReq"] = _clean_value("Job/Req #", result["jobReq"])
+
+    job_title = result.get("title") or "Unknown"
+    if job_title != "Unknown":
+        print("Job title found: ", job_title)
+    else:
+        print("Job title not found with known selectors.")
+
+    company = result.get("company")
+    if company is not None:
+        print("Company found: ", company)
+    else:
+        company = "Unknown"
+        print("Company not found from meta tag.")
+
+    location = result.get("location") or "Unknown"
+    if location != "Unknown":
+        print("Location found: ", location)
+    else:
+        print("Location not confidently detected.")
+
+    job_req = result.get("jobReq") or "Unknown"
+    if job_req != "Unknown":
+        print("Job/Requisition # found: ", job_req)
+    else:
+        print("Job/Requisition ID not found or parse failed.")
+
+    info = {
+        "Job Title": job_title,
+        "Company": company,
+        "Location": location,
+        "Job/Req #": job_req
+    }
+    sources = {field: found[key] for field, key in SCRIPT_KEYS.items() if found.get(key)}
+    # Fields the generic cascade found get a selector learned for them in one more round trip
+    unlearned = {key: info[field] for field, key in SCRIPT_KEYS.items()
+                 if info[field] != "Unknown" and field not in sources}
+    if unlearned:
+        learned = driver.execute_script(LEARN_SCRIPT, unlearned, SELECTOR_ATTRS, SELECTOR_MAX_DEPTH) or {}
+        for field, key in SCRIPT_KEYS.items():
+            if learned.get(key):
+                sources[field] = learned[key]
+    return info, sources
@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+from file_lock import FileLock
+from constants import YELLOW, RESET
+
+OP_PUT = "put"
+OP_DELETE = "delete"
+
+def journal_path(workbook_path):
+    return f"{workbook_path}.journal"
+
+class MutationJournal:
+    # One JSON line per mutation, fsync'd before the write returns. Entries are idempotent
+    # (put = upsert of the full row, delete = remove if present), so replaying twice is harmless.
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._owner = None
+
+    def claim(self):
+        # Only one process may write and replay a journal; False while another one holds it
+        if self._owner is None:
+            owner = FileLock(f"{self.path}.lock")
+            if not owner.acquire(blocking=False):
+                return False
+            self._owner = owner
+        return True
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a+", encoding="utf-8")
+            # Start on a fresh line if the last write was cut off by a crash
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        return self._file
+
+    def record(self, entries):
+        if not entries:
+            return
+        data = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+        with self._lock:
+            f = self._open()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self):
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line torn by a crash mid-write; the entries around it are intact
+                        print(f"{YELLOW}Ignoring incomplete journal entry in {self.path}{RESET}")
+                        continue
+                    entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def pending(self):
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def clear(self):
+        # Called once the entries are safely in the workbook
+        with self._lock:
+            f = self._open()
+            f.seek(0)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._owner is not None:
+                self._owner.release()
+                self._owner = None
@@ -0,0 +1,69 @@
+import logging
+import re
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from constants import GREEN, YELLOW, RED, CYAN, LOG_MAX_LINES, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+
+# Messages are already colored by severity, so the color doubles as the level
+COLOR_LEVELS = [(RED, ERROR), (YELLOW, WARNING), (GREEN, INFO), (CYAN, DEBUG)]
+ANSI_CODE = re.compile(r"\033\[[0-9;]*m")
+
+def message_level(message, default=INFO):
+    for color, level in COLOR_LEVELS:
+        if color in message:
+            return level
+    return default
+
+class LogSink:
+    # Any thread can write; the Tk thread takes new lines in batches with drain().
+    def __init__(self, max_lines=LOG_MAX_LINES, log_file=None):
+        self.lines = deque(maxlen=max_lines)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._partial = threading.local()
+        self._logger = None
+        if log_file:
+            handler = RotatingFileHandler(log_file, maxBytes=LOG_FILE_MAX_BYTES,
+                                          backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            self._logger = logging.getLogger("job_tracker")
+            self._logger.propagate = False
+            self._logger.setLevel(DEBUG)
+            self._logger.addHandler(handler)
+
+    def write(self, text, level=None):
+        # Stream interface: print() hands over pieces, so lines are assembled per thread
+        buffered = getattr(self._partial, "text", "") + text
+        *lines, self._partial.text = buffered.split("\n")
+        for line in lines:
+            self.add(line, level)
+
+    def add(self, message, level=None):
+        if not message.strip():
+            return
+        if level is None:
+            level = message_level(message)
+        text = ANSI_CODE.sub("", message).rstrip()
+        entry = (level, text)
+        with self._lock:
+            self._pending.append(entry)
+        if self._logger is not None:
+            self._logger.log(level, text)
+
+    def drain(self):
+        with self._lock:
+            entries, self._pending = self._pending, []
+        self.lines.extend(entries)
+        return entries[-self.lines.maxlen:]
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+        self.lines.clear()
@@ -1,8 +1,10 @@
+from startup_timer import mark
 import signal
 import sys
-import tkinter as tk
-from gui import JobTrackerGUI
-from excel_handler import init_excel
+from excel_handler import init_excel, close_store, start_excel_discovery
+from driver_pool import shutdown_driver_pool
+from task_queue import get_task_queue, shutdown_task_queue, LANE_IO
+from constants import TASK_POLL_MS
 
 def signal_handler(sig, frame):
     print("\nCtrl+C pressed, exiting...")
@@ -12,25 +14,46 @@ def signal_handler(sig, frame):
         sys.exit(0)
 
 def main():
-    init_excel()
+    # GUI imports stay here so the command-line mode never loads tkinter
+    import tkinter as tk
+    from gui import JobTrackerGUI
+    mark("imports")
+    start_excel_discovery()
+    tasks = get_task_queue()
+    # Runs once workbook discovery finishes; queued ahead of the GUI's first table load
+    tasks.submit(LANE_IO, init_excel)
 
     root = tk.Tk()
+    mark("tk root")
     app = JobTrackerGUI(root)
+    mark("gui built")
 
     signal.signal(signal.SIGINT, signal_handler)
 
     def poll():
-        root.after(100, poll)
+        tasks.drain()
+        root.after(TASK_POLL_MS, poll)
     poll()
 
     def on_close():
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
+        shutdown_task_queue()
+        close_store()
+        shutdown_driver_pool()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
+    sys.stdout = sys.__stdout__
+    sys.stderr = sys.__stderr__
+    shutdown_task_queue()
+    close_store()
+    shutdown_driver_pool()
     print("Application closed.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run(sys.argv[1:]))
     main()
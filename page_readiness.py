@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+from constants import (CONFIG_DIR, PAGE_READY_TIMEOUT, PAGE_READY_MIN_TIMEOUT, PAGE_READY_POLL,
+                       PAGE_STABLE_WINDOW, PAGE_TIMINGS_FILE, GREEN, YELLOW, RED, CYAN, RESET)
+
+# Installs a MutationObserver on first call and reports the signals the extractors rely on.
+# arguments[0] is the title XPath list, so any anchor the title extractor accepts also counts as a heading here.
+READY_PROBE = """
+if (window.__jobTrackerMutations === undefined) {
+    window.__jobTrackerMutations = 0;
+    try {
+        new MutationObserver(function (records) {
+            window.__jobTrackerMutations += records.length;
+        }).observe(document, {childList: true, subtree: true, characterData: true});
+    } catch (e) {}
+}
+var hasHeading = false;
+for (var i = 0; i < arguments[0].length && !hasHeading; i++) {
+    try {
+        var nodes = document.evaluate(arguments[0][i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var j = 0; j < nodes.snapshotLength; j++) {
+            if ((nodes.snapshotItem(j).textContent || '').trim()) {
+                hasHeading = true;
+                break;
+            }
+        }
+    } catch (e) {}
+}
+return {
+    readyState: document.readyState,
+    hasHeading: hasHeading,
+    hasSiteName: !!document.querySelector('meta[property="og:site_name"]'),
+    mutations: window.__jobTrackerMutations
+};
+"""
+
+class PageTimings:
+    def __init__(self, path=PAGE_TIMINGS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._timings = None
+
+    def _load(self):
+        if self._timings is not None:
+            return
+        self._timings = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._timings = {k: float(v) for k, v in data.items()}
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def get(self, domain):
+        with self._lock:
+            self._load()
+            return self._timings.get(domain)
+
+    def record(self, domain, seconds):
+        with self._lock:
+            self._load()
+            previous = self._timings.get(domain)
+            # Exponential moving average so one slow load doesn't dominate
+            self._timings[domain] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+            try:
+                CONFIG_DIR.mkdir(exist_ok=True)
+                with open(self.path, "w") as f:
+                    json.dump(self._timings, f, indent=2)
+            except OSError:
+                print(f"{RED}Failed to save page timings.{RESET}")
+
+page_timings = PageTimings()
+
+def get_domain(url):
+    return urlsplit(url).netloc.lower()
+
+def ready_budget(domain):
+    learned = page_timings.get(domain)
+    if learned is None:
+        return PAGE_READY_TIMEOUT
+    return min(PAGE_READY_TIMEOUT, max(PAGE_READY_MIN_TIMEOUT, learned * 2))
+
+def _is_ready(state, stable_for):
+    if state["readyState"] == "loading" or not state["hasHeading"]:
+        return False
+    if state["hasSiteName"]:
+        return stable_for >= PAGE_STABLE_WINDOW
+    # Without og:site_name, give late-rendering meta tags a little longer to appear
+    return stable_for >= PAGE_STABLE_WINDOW * 2
+
+def wait_for_page_ready(driver, url, title_xpaths):
+    domain = get_domain(url)
+    budget = ready_budget(domain)
+    start = time.monotonic()
+    deadline = start + budget
+    last_mutations = None
+    stable_since = start
+
+    while True:
+        now = time.monotonic()
+        try:
+            state = driver.execute_script(READY_PROBE, title_xpaths) or {}
+        except Exception:
+            state = {}
+
+        mutations = state.get("mutations")
+        if mutations != last_mutations:
+            last_mutations = mutations
+            stable_since = now
+
+        if state and _is_ready(state, now - stable_since):
+            elapsed = now - start
+            print(f"{GREEN}Page ready after {elapsed:.2f}s ({domain}).{RESET}")
+            page_timings.record(domain, elapsed)
+            return True
+
+        if now >= deadline:
+            # Not recorded: a timeout only says the page took at least this long, and feeding
+            # the budget back in would pin the learned time at the ceiling for good
+            print(f"{YELLOW}Page not fully settled after {budget:.1f}s, parsing anyway.{RESET}")
+            return False
+
+        time.sleep(PAGE_READY_POLL)
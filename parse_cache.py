@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from constants import CONFIG_DIR, PARSE_CACHE_FILE, PARSE_CACHE_TTL, PARSE_CACHE_MAX_ENTRIES, CYAN, RED, RESET
+from urls import normalize_url
+
+class ParseCache:
+    # Parse results by normalized URL; least recently used entries are evicted past max_entries.
+    def __init__(self, path=PARSE_CACHE_FILE, ttl=PARSE_CACHE_TTL, max_entries=PARSE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                for key, entry in data.items():
+                    if isinstance(entry, dict) and isinstance(entry.get("info"), dict):
+                        self._entries[key] = {"info": entry["info"], "saved": float(entry.get("saved", 0)),
+                                              "sources": entry.get("sources") or {}}
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def _save(self):
+        try:
+            CONFIG_DIR.mkdir(exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self._entries, f)
+        except OSError:
+            print(f"{RED}Failed to save parse cache.{RESET}")
+
+    def get(self, url):
+        key = normalize_url(url)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["saved"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            print(f"{CYAN}Parse cache {'hit' if entry else 'miss'} "
+                  f"(hits: {self.hits}, misses: {self.misses}){RESET}")
+            return dict(entry["info"]) if entry else None
+
+    def put(self, url, info, sources=None):
+        # sources maps each field to the selector that produced it
+        key = normalize_url(url)
+        with self._lock:
+            self._load()
+            self._entries[key] = {"info": dict(info), "saved": time.time(), "sources": dict(sources or {})}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def sources(self, url):
+        with self._lock:
+            self._load()
+            entry = self._entries.get(normalize_url(url))
+            return dict(entry["sources"]) if entry else {}
+
+    def correct(self, url, corrections):
+        # Keeps user fixes so adding the URL again returns the corrected values
+        key = normalize_url(url)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["info"].update(corrections)
+            for field in corrections:
+                entry["sources"].pop(field, None)
+            self._save()
+
+    def invalidate(self, url):
+        key = normalize_url(url)
+        with self._lock:
+            self._load()
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+parse_cache = ParseCache()
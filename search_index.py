@@ -0,0 +1,132 @@
+import threading
+from collections import defaultdict
+from constants import SEARCH_BUILD_CHUNK
+
+GRAM_SIZE = 3
+
+def _grams(text):
+    # Trigrams only; shorter grams would multiply the postings for little gain
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+def query_terms(text):
+    # Longest first, since long terms usually narrow the candidates fastest
+    return sorted(set(text.lower().split()), key=len, reverse=True)
+
+def row_matches(terms, values):
+    # Same rule as SearchIndex.query, for scanning rows without building an index
+    cells = [str(cell).lower() for cell in values]
+    return all(any(term in cell for cell in cells) for term in terms)
+
+class SearchIndex:
+    # Inverted trigram index over every column; multi-word queries must match all terms.
+    def __init__(self, records=None):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(set)
+        self._docs = {}
+        self._order = {}
+        self._next_order = 0
+        self._removed = set()
+        self.ready = threading.Event()
+        if records is not None:
+            self.build(records)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def build(self, records):
+        # Fills the index a chunk at a time, so add/update/remove and other threads are never
+        # blocked for the whole build. Rows changed meanwhile keep their newer values.
+        records = list(records)
+        with self._lock:
+            # Positions are taken up front so rows added during the build sort after these
+            for row_id, _ in records:
+                self._assign_order(row_id)
+        for start in range(0, len(records), SEARCH_BUILD_CHUNK):
+            with self._lock:
+                for row_id, values in records[start:start + SEARCH_BUILD_CHUNK]:
+                    if row_id not in self._docs and row_id not in self._removed:
+                        self._index(row_id, values)
+        with self._lock:
+            self._removed.clear()
+        self.ready.set()
+
+    def add(self, row_id, values):
+        with self._lock:
+            if row_id in self._docs:
+                self._unindex(row_id)
+            self._assign_order(row_id)
+            self._removed.discard(row_id)
+            self._index(row_id, values)
+
+    def _assign_order(self, row_id):
+        if row_id not in self._order:
+            self._order[row_id] = self._next_order
+            self._next_order += 1
+
+    def _index(self, row_id, values):
+        cells = tuple(str(cell).lower() for cell in values)
+        self._docs[row_id] = (tuple(values), cells)
+        for gram in self._doc_grams(cells):
+            self._postings[gram].add(row_id)
+
+    def _doc_grams(self, cells):
+        grams = set()
+        for cell in cells:
+            grams |= _grams(cell)
+        return grams
+
+    def update(self, row_id, values):
+        self.add(row_id, values)
+
+    def remove(self, row_id):
+        with self._lock:
+            if not self.ready.is_set():
+                # Keeps a build that already read this row from adding it back
+                self._removed.add(row_id)
+            self._order.pop(row_id, None)
+            if row_id not in self._docs:
+                return
+            self._unindex(row_id)
+            del self._docs[row_id]
+
+    def _unindex(self, row_id):
+        _, cells = self._docs[row_id]
+        for gram in self._doc_grams(cells):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(row_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _match_term(self, term, candidates):
+        if len(term) < GRAM_SIZE:
+            # Too short to have a trigram; longer terms run first, so this usually scans few rows
+            pool = self._docs if candidates is None else candidates
+            return {row_id for row_id in pool if any(term in cell for cell in self._docs[row_id][1])}
+        grams = sorted(_grams(term), key=lambda g: len(self._postings.get(g, ())))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return candidates
+        if len(term) > GRAM_SIZE:
+            # n-gram hits can span two positions, so confirm the full term
+            candidates = {row_id for row_id in candidates
+                          if any(term in cell for cell in self._docs[row_id][1])}
+        return candidates
+
+    def query(self, text):
+        terms = query_terms(text)
+        with self._lock:
+            if not terms:
+                matched = set(self._docs)
+            else:
+                matched = None
+                for term in terms:
+                    matched = self._match_term(term, matched)
+                    if not matched:
+                        return []
+            ordered = sorted(matched, key=self._order.__getitem__)
+            return [(row_id, self._docs[row_id][0]) for row_id in ordered]
@@ -0,0 +1,41 @@
+import os
+import pickle
+from constants import SNAPSHOT_FILE, CONFIG_DIR, YELLOW, RESET
+
+def file_key(path):
+    # A workbook is considered unchanged while its path, mtime and size all match
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+def load_snapshot(snapshot_path=SNAPSHOT_FILE):
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+        print(f"{YELLOW}Ignoring unreadable table snapshot: {e}{RESET}")
+        return None
+    if not isinstance(snapshot, dict) or "key" not in snapshot or "records" not in snapshot:
+        return None
+    return snapshot
+
+def snapshot_matches(snapshot, workbook_path):
+    return snapshot is not None and tuple(snapshot["key"]) == file_key(workbook_path)
+
+def save_snapshot(workbook_path, records, snapshot_path=SNAPSHOT_FILE):
+    key = file_key(workbook_path)
+    if key is None:
+        return
+    CONFIG_DIR.mkdir(exist_ok=True)
+    # Written to a temp file first so a crash never leaves a half-written snapshot behind
+    tmp_path = f"{snapshot_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "records": records}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:
+        print(f"{YELLOW}Could not write table snapshot: {e}{RESET}")
@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from application_store import new_row_id, column_indexes, iter_workbook_records, write_workbook
+from constants import HEADERS, GREEN, YELLOW, RED, CYAN, RESET
+
+# SQL column for each header, in HEADERS order
+COLUMNS = ["date_applied", "job_title", "company", "location", "job_req", "link"]
+INDEXED_COLUMNS = ["company", "date_applied", "job_req", "link"]
+
+def _to_sql(val):
+    if isinstance(val, datetime):
+        return val.strftime('%Y-%m-%d')
+    if isinstance(val, date):
+        return val.isoformat()
+    return val
+
+class SQLiteStore:
+    def __init__(self, path, workbook_path=None):
+        self.path = path
+        self._lock = threading.RLock()
+        is_new = not os.path.exists(path)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        if is_new and workbook_path and os.path.exists(workbook_path):
+            self.import_workbook(workbook_path)
+
+    def _create_schema(self):
+        columns = ", ".join(f"{col} TEXT" for col in COLUMNS)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS applications (id INTEGER PRIMARY KEY, uid TEXT, {columns})"
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(applications)")}
+            if "uid" not in existing:
+                self._conn.execute("ALTER TABLE applications ADD COLUMN uid TEXT")
+            missing = self._conn.execute("SELECT id FROM applications WHERE uid IS NULL").fetchall()
+            self._conn.executemany("UPDATE applications SET uid = ? WHERE id = ?",
+                                   [(new_row_id(), row[0]) for row in missing])
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_uid ON applications (uid)")
+            for col in INDEXED_COLUMNS:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_applications_{col} ON applications ({col})")
+
+    def _row_params(self, row_data):
+        values = [_to_sql(val) for val in list(row_data)[:len(COLUMNS)]]
+        return values + [None] * (len(COLUMNS) - len(values))
+
+    def records(self):
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT uid, {', '.join(COLUMNS)} FROM applications ORDER BY id")
+            return [(row[0], tuple(row[1:])) for row in cursor]
+
+    def iter_rows(self, offset=0, limit=None, columns=None, batch_size=1000):
+        indexes = column_indexes(columns)
+        selected = [COLUMNS[i] for i in indexes] if indexes is not None else COLUMNS
+        remaining = limit
+        last_id = None
+        # Keyset paging keeps each batch short and never holds the lock between batches
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            with self._lock:
+                if last_id is None:
+                    batch = self._conn.execute(
+                        f"SELECT id, {', '.join(selected)} FROM applications ORDER BY id LIMIT ? OFFSET ?",
+                        (size, offset)).fetchall()
+                else:
+                    batch = self._conn.execute(
+                        f"SELECT id, {', '.join(selected)} FROM applications WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, size)).fetchall()
+            if not batch:
+                return
+            for row in batch:
+                yield tuple(row[1:])
+            last_id = batch[-1][0]
+            if remaining is not None:
+                remaining -= len(batch)
+
+    def get(self, row_id):
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM applications WHERE uid = ?", (row_id,)
+            ).fetchone()
+
+    def append(self, row_data, row_id=None):
+        return self.append_many([row_data], [row_id])[0]
+
+    def append_many(self, rows, row_ids=None):
+        if not rows:
+            return []
+        row_ids = [row_id or new_row_id() for row_id in (row_ids or [None] * len(rows))]
+        placeholders = ", ".join("?" for _ in range(len(COLUMNS) + 1))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO applications (uid, {', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [[row_id] + self._row_params(row) for row_id, row in zip(row_ids, rows)]
+            )
+        return row_ids
+
+    def delete(self, row_id):
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM applications WHERE uid = ?", (row_id,)).rowcount
+        if deleted:
+            print("Successfully Deleted Row")
+        return bool(deleted)
+
+    def update(self, row_id, new_values):
+        assignments = ", ".join(f"{col} = ?" for col in COLUMNS)
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                f"UPDATE applications SET {assignments} WHERE uid = ?",
+                self._row_params(new_values) + [row_id]
+            ).rowcount
+        return bool(updated)
+
+    def apply_changes(self, puts=(), deletes=()):
+        # All rows change in one transaction; returns the ids that were actually deleted
+        assignments = ", ".join(f"{col} = ?" for col in COLUMNS)
+        placeholders = ", ".join("?" for _ in range(len(COLUMNS) + 1))
+        deleted = []
+        with self._lock, self._conn:
+            for row_id, values in puts:
+                params = self._row_params(values)
+                if not self._conn.execute(f"UPDATE applications SET {assignments} WHERE uid = ?",
+                                          params + [row_id]).rowcount:
+                    self._conn.execute(
+                        f"INSERT INTO applications (uid, {', '.join(COLUMNS)}) VALUES ({placeholders})",
+                        [row_id] + params)
+            for row_id in deletes:
+                if self._conn.execute("DELETE FROM applications WHERE uid = ?", (row_id,)).rowcount:
+                    deleted.append(row_id)
+        return deleted
+
+    def import_workbook(self, workbook_path):
+        records = []
+        seen = set()
+        for row_id, values in iter_workbook_records(workbook_path):
+            if row_id is None or row_id in seen:
+                row_id = new_row_id()
+            seen.add(row_id)
+            records.append((row_id, values))
+        self.append_many([values for _, values in records], [row_id for row_id, _ in records])
+        print(f"{GREEN}Imported {len(records)} applications from {workbook_path}{RESET}")
+
+    def export_workbook(self, workbook_path):
+        write_workbook(workbook_path, self.records())
+        print(f"{GREEN}Exported applications to {workbook_path}{RESET}")
+
+    def flush(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,24 @@
+import time
+from constants import CYAN, RESET
+
+# Imported first by main so the clock starts before the heavy modules load
+_start = time.perf_counter()
+_marks = []
+_reported = False
+
+def mark(label):
+    _marks.append((label, time.perf_counter() - _start))
+
+def report(label):
+    # Records the final milestone and prints the timeline once per run
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    mark(label)
+    previous = 0.0
+    lines = []
+    for name, elapsed in _marks:
+        lines.append(f"  {name:<20} {elapsed * 1000:7.0f} ms  (+{(elapsed - previous) * 1000:.0f} ms)")
+        previous = elapsed
+    print(f"{CYAN}Startup timeline:\n" + "\n".join(lines) + f"{RESET}")
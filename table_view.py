@@ -0,0 +1,474 @@
+import re
+from datetime import date, datetime
+from constants import HEADERS, ROW_HEIGHT, VIRTUAL_OVERSCAN
+
+DATE_FORMATS = ['%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y']
+ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+NATURAL_CHUNKS = re.compile(r'\d+')
+
+def display_text(value):
+    return "" if value is None else str(value)
+
+# Keys are (kind, value) tuples so mixed types never compare directly; blanks sort last.
+def date_key(value):
+    if isinstance(value, (date, datetime)):
+        return (0, value.year * 10000 + value.month * 100 + value.day)
+    text = display_text(value).strip()
+    if ISO_DATE.fullmatch(text):
+        return (0, int(text[:4] + text[5:7] + text[8:10]))
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+            return (0, parsed.year * 10000 + parsed.month * 100 + parsed.day)
+        except ValueError:
+            continue
+    return (1 if text else 2, text.casefold())
+
+def natural_key(value):
+    text = display_text(value).strip().casefold()
+    if not text:
+        return (2, "")
+    # Zero-padding every digit run makes plain string comparison order numbers by value
+    return (0, NATURAL_CHUNKS.sub(lambda m: m.group().zfill(20), text))
+
+def text_key(value):
+    text = display_text(value).strip().casefold()
+    return (0 if text else 2, text)
+
+COLUMN_SORT_KEYS = {
+    "Date Applied": date_key,
+    "Job/Req #": natural_key,
+}
+
+class SortCache:
+    # Typed sort keys per column, computed once per row, plus the ascending order per column
+    def __init__(self):
+        self._keys = {}
+        self._orders = {}
+
+    def invalidate_rows(self, row_ids):
+        if not row_ids:
+            return
+        for keys in self._keys.values():
+            for row_id in row_ids:
+                keys.pop(row_id, None)
+        self._orders.clear()
+
+    def clear(self):
+        self._keys.clear()
+        self._orders.clear()
+
+    def _column_keys(self, ids, values, col_index):
+        key_func = COLUMN_SORT_KEYS.get(HEADERS[col_index], text_key)
+        keys = self._keys.setdefault(col_index, {})
+        for row_id in ids:
+            if row_id not in keys:
+                row = values[row_id]
+                keys[row_id] = key_func(row[col_index] if col_index < len(row) else None)
+        return keys
+
+    def position(self, ids, values, row_id, col_index, reverse):
+        # Index in ids (already in this sort order) where row_id belongs; it goes after its ties
+        keys = self._column_keys([row_id], values, col_index)
+        target = keys[row_id]
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = self._column_keys([ids[mid]], values, col_index)[ids[mid]]
+            if (key < target) if reverse else (key > target):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def order(self, ids, values, col_index, reverse):
+        # The cached order is reused (e.g. when only the direction flips) while the row set is unchanged
+        members = frozenset(ids)
+        cached = self._orders.get(col_index)
+        if cached is not None and cached[0] == members:
+            ascending = cached[1]
+        else:
+            keys = self._column_keys(ids, values, col_index)
+            # Sorting the ids list (not the set) keeps ties in their current order
+            ascending = sorted(ids, key=keys.__getitem__)
+            self._orders[col_index] = (members, ascending)
+        if not reverse:
+            return list(ascending)
+        # Walk runs of equal keys from the end so ties keep their order, like sorted(reverse=True)
+        keys = self._keys[col_index]
+        descending = []
+        end = len(ascending)
+        while end > 0:
+            start = end - 1
+            while start > 0 and keys[ascending[start - 1]] == keys[ascending[end - 1]]:
+                start -= 1
+            descending.extend(ascending[start:end])
+            end = start
+        return descending
+
+class TableView:
+    # Keeps the Treeview in step with a list of (row_id, values) records by applying only the differences.
+    virtual = False
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._values = {}
+        self._shown = []
+        self.sort_state = None
+        self._sort_cache = SortCache()
+
+    def __contains__(self, row_id):
+        return row_id in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def shown(self):
+        return list(self._shown)
+
+    def _insert_position(self, row_id):
+        if self.sort_state is None:
+            return len(self._shown)
+        return self._sort_cache.position(self._shown, self._values, row_id, *self.sort_state)
+
+    def insert(self, row_id, values, tags=()):
+        values = tuple(values)
+        self._sort_cache.invalidate_rows([row_id])
+        if row_id not in self._values:
+            self._values[row_id] = values
+            position = self._insert_position(row_id)
+            self.tree.insert('', position, iid=row_id, values=values, tags=tags)
+            self._shown.insert(position, row_id)
+            return
+        self.update(row_id, values, tags)
+        if row_id not in self._shown:
+            position = self._insert_position(row_id)
+            self.tree.move(row_id, '', position)
+            self._shown.insert(position, row_id)
+
+    def update(self, row_id, values, tags=None):
+        values = tuple(values)
+        if row_id not in self._values:
+            return
+        if self._values[row_id] != values:
+            self.tree.item(row_id, values=values)
+            self._values[row_id] = values
+            self._sort_cache.invalidate_rows([row_id])
+        if tags is not None:
+            self.tree.item(row_id, tags=tags)
+
+    def set_tags(self, row_id, tags):
+        if row_id in self._values:
+            self.tree.item(row_id, tags=tags)
+
+    def remove(self, row_id):
+        if row_id not in self._values:
+            return
+        self.tree.delete(row_id)
+        del self._values[row_id]
+        self._sort_cache.invalidate_rows([row_id])
+        if row_id in self._shown:
+            self._shown.remove(row_id)
+
+    def row_state(self, row_id):
+        return self._values[row_id], self.tree.item(row_id, 'tags')
+
+    def selection(self):
+        return list(self.tree.selection())
+
+    def see(self, row_id):
+        if row_id in self._shown:
+            self.tree.see(row_id)
+
+    def sort(self, col_index, reverse):
+        self.sort_state = (col_index, reverse)
+        order = self._sort_cache.order(self._shown, self._values, col_index, reverse)
+        if order != self._shown:
+            self.tree.set_children('', *order)
+        self._shown = order
+
+    def show(self, records, complete=True, keep=()):
+        # complete=True means records is the whole data set, so anything else can be deleted;
+        # otherwise (a filtered view) rows are only detached and can be reattached cheaply later.
+        yview = self.tree.yview()[0]
+        order = []
+        wanted = set()
+        changed = []
+        for row_id, values in records:
+            values = tuple(values)
+            wanted.add(row_id)
+            order.append(row_id)
+            if row_id not in self._values:
+                self.tree.insert('', 'end', iid=row_id, values=values)
+                self._values[row_id] = values
+                changed.append(row_id)
+            elif self._values[row_id] != values:
+                self.tree.item(row_id, values=values)
+                self._values[row_id] = values
+                changed.append(row_id)
+        self._sort_cache.invalidate_rows(changed)
+        order.extend(row_id for row_id in keep if row_id in self._values and row_id not in wanted)
+        if self.sort_state is not None:
+            order = self._sort_cache.order(order, self._values, *self.sort_state)
+        wanted.update(keep)
+
+        stale = [row_id for row_id in self._values if row_id not in wanted]
+        if complete and stale:
+            self.tree.delete(*stale)
+            for row_id in stale:
+                del self._values[row_id]
+            self._sort_cache.invalidate_rows(stale)
+
+        if order != self._shown:
+            self.tree.set_children('', *order)
+        self._shown = order
+        self.tree.yview_moveto(yview)
+
+    def detach(self):
+        self.tree.delete(*self.tree.get_children(''))
+        self._values = {}
+        self._shown = []
+        self._sort_cache.clear()
+
+class VirtualTableView:
+    # Holds every row in Python and only materializes the visible window (plus overscan) as Tk items.
+    virtual = True
+
+    def __init__(self, tree, scrollbar, overscan=VIRTUAL_OVERSCAN):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.overscan = overscan
+        self._values = {}
+        self._tags = {}
+        self._order = []
+        self._positions = {}
+        self._offset = 0
+        self._materialized = []
+        self._selection = set()
+        self._rendering = False
+        self.sort_state = None
+        self._sort_cache = SortCache()
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand=lambda *args: None)
+        self._bindings = [
+            (seq, self.tree.bind(seq, handler, add='+'))
+            for seq, handler in [
+                ("<MouseWheel>", self._on_mousewheel),
+                ("<Button-4>", lambda event: self._scroll_by(-3)),
+                ("<Button-5>", lambda event: self._scroll_by(3)),
+                ("<Configure>", lambda event: self._render()),
+                ("<<TreeviewSelect>>", self._on_select),
+                ("<Up>", lambda event: self._on_arrow(-1)),
+                ("<Down>", lambda event: self._on_arrow(1)),
+                ("<Prior>", lambda event: self._scroll_by(-self._visible_rows())),
+                ("<Next>", lambda event: self._scroll_by(self._visible_rows())),
+                ("<Home>", lambda event: self._scroll_to(0)),
+                ("<End>", lambda event: self._scroll_to(len(self._order))),
+            ]
+        ]
+
+    def __contains__(self, row_id):
+        return row_id in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def shown(self):
+        return list(self._order)
+
+    def _reindex(self):
+        self._positions = {row_id: idx for idx, row_id in enumerate(self._order)}
+
+    def _visible_rows(self):
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget('height'))
+        # One row's worth of space goes to the column headings
+        return max(1, height // ROW_HEIGHT - 1)
+
+    def _render(self):
+        visible = self._visible_rows()
+        max_offset = max(0, len(self._order) - visible)
+        self._offset = min(max(0, self._offset), max_offset)
+        window = self._order[self._offset:self._offset + visible + self.overscan]
+
+        self._rendering = True
+        try:
+            wanted = set(window)
+            stale = [row_id for row_id in self._materialized if row_id not in wanted]
+            if stale:
+                self.tree.delete(*stale)
+            existing = set(self._materialized) - set(stale)
+            for row_id in window:
+                if row_id not in existing:
+                    self.tree.insert('', 'end', iid=row_id, values=self._values[row_id],
+                                     tags=self._tags.get(row_id, ()))
+            if window != self._materialized:
+                self.tree.set_children('', *window)
+            self._materialized = window
+            self.tree.yview_moveto(0)
+            selected = [row_id for row_id in window if row_id in self._selection]
+            if tuple(selected) != self.tree.selection():
+                self.tree.selection_set(selected)
+        finally:
+            self._rendering = False
+
+        total = len(self._order)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_select(self, event=None):
+        if self._rendering:
+            return
+        materialized = set(self._materialized)
+        self._selection = {row_id for row_id in self._selection if row_id not in materialized}
+        self._selection.update(self.tree.selection())
+
+    def _scroll_to(self, offset):
+        self._offset = offset
+        self._render()
+        return "break"
+
+    def _scroll_by(self, rows):
+        return self._scroll_to(self._offset + rows)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_arrow(self, step):
+        focus = self.tree.focus()
+        if focus not in self._positions:
+            return None
+        target = self._positions[focus] + step
+        if not 0 <= target < len(self._order):
+            return "break"
+        visible = self._visible_rows()
+        if target < self._offset:
+            self._offset = target
+        elif target >= self._offset + visible:
+            self._offset = target - visible + 1
+        else:
+            return None
+        row_id = self._order[target]
+        self._selection = {row_id}
+        self._render()
+        self.tree.focus(row_id)
+        self.tree.selection_set(row_id)
+        return "break"
+
+    def yview(self, *args):
+        total = len(self._order)
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self._visible_rows()
+            self._scroll_by(amount)
+
+    def insert(self, row_id, values, tags=()):
+        self._sort_cache.invalidate_rows([row_id])
+        self._values[row_id] = tuple(values)
+        self._tags[row_id] = tags
+        if row_id not in self._positions:
+            if self.sort_state is None:
+                self._positions[row_id] = len(self._order)
+                self._order.append(row_id)
+            else:
+                position = self._sort_cache.position(self._order, self._values, row_id, *self.sort_state)
+                self._order.insert(position, row_id)
+                self._reindex()
+        self._render()
+
+    def update(self, row_id, values, tags=None):
+        if row_id not in self._values:
+            return
+        self._values[row_id] = tuple(values)
+        self._sort_cache.invalidate_rows([row_id])
+        if tags is not None:
+            self._tags[row_id] = tags
+        if row_id in self._materialized:
+            self.tree.item(row_id, values=self._values[row_id], tags=self._tags.get(row_id, ()))
+
+    def set_tags(self, row_id, tags):
+        if row_id in self._values:
+            self._tags[row_id] = tags
+            if row_id in self._materialized:
+                self.tree.item(row_id, tags=tags)
+
+    def remove(self, row_id):
+        if row_id not in self._values:
+            return
+        del self._values[row_id]
+        self._tags.pop(row_id, None)
+        self._selection.discard(row_id)
+        self._sort_cache.invalidate_rows([row_id])
+        if row_id in self._positions:
+            del self._order[self._positions[row_id]]
+            self._reindex()
+        self._render()
+
+    def row_state(self, row_id):
+        return self._values[row_id], self._tags.get(row_id, ())
+
+    def selection(self):
+        # Includes selected rows that are scrolled out of the rendered window
+        return [row_id for row_id in self._order if row_id in self._selection]
+
+    def see(self, row_id):
+        idx = self._positions.get(row_id)
+        if idx is None:
+            return
+        visible = self._visible_rows()
+        if idx < self._offset or idx >= self._offset + visible:
+            self._scroll_to(idx - visible // 2)
+
+    def sort(self, col_index, reverse):
+        self.sort_state = (col_index, reverse)
+        self._order = self._sort_cache.order(self._order, self._values, col_index, reverse)
+        self._reindex()
+        self._render()
+
+    def show(self, records, complete=True, keep=()):
+        order = []
+        wanted = set()
+        changed = []
+        for row_id, values in records:
+            values = tuple(values)
+            wanted.add(row_id)
+            order.append(row_id)
+            if self._values.get(row_id) != values:
+                self._values[row_id] = values
+                changed.append(row_id)
+        self._sort_cache.invalidate_rows(changed)
+        order.extend(row_id for row_id in keep if row_id in self._values and row_id not in wanted)
+        if self.sort_state is not None:
+            order = self._sort_cache.order(order, self._values, *self.sort_state)
+        wanted.update(keep)
+        if complete:
+            stale = [row_id for row_id in self._values if row_id not in wanted]
+            for row_id in stale:
+                del self._values[row_id]
+                self._tags.pop(row_id, None)
+            self._sort_cache.invalidate_rows(stale)
+            self._selection &= wanted
+        # Rows already on screen may have new values
+        for row_id in self._materialized:
+            if row_id in self._values:
+                self.tree.item(row_id, values=self._values[row_id])
+        self._order = order
+        self._reindex()
+        self._render()
+
+    def detach(self):
+        for seq, funcid in self._bindings:
+            self.tree.unbind(seq, funcid)
+        self.tree.delete(*self.tree.get_children(''))
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self._materialized = []
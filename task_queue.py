@@ -0,0 +1,106 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from constants import PARSE_MAX_WORKERS, GREEN, YELLOW, RED, CYAN, RESET
+
+LANE_PARSE = "parse"
+LANE_IO = "io"
+
+class Task:
+    def __init__(self, lane, func, args, kwargs, on_start=None, on_done=None, on_error=None):
+        self.lane = lane
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_start = on_start
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        # Queued tasks never start; running ones finish but their callbacks are dropped
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+class TaskQueue:
+    def __init__(self, parse_workers=PARSE_MAX_WORKERS):
+        # Workbook access stays on a single ordered worker; parsing fans out.
+        self._lanes = {
+            LANE_PARSE: ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="parse"),
+            LANE_IO: ThreadPoolExecutor(max_workers=1, thread_name_prefix="workbook-io"),
+        }
+        self._results = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, lane, func, *args, on_start=None, on_done=None, on_error=None, **kwargs):
+        task = Task(lane, func, args, kwargs, on_start, on_done, on_error)
+        with self._lock:
+            self._pending.add(task)
+        task.future = self._lanes[lane].submit(self._run, task)
+        # Also fires when a queued task is cancelled and _run never gets to execute
+        task.future.add_done_callback(lambda future: self._forget(task))
+        return task
+
+    def _forget(self, task):
+        with self._lock:
+            self._pending.discard(task)
+
+    def _run(self, task):
+        if task.cancelled:
+            return
+        self._results.put((task, task.on_start, ()))
+        try:
+            result = task.func(*task.args, **task.kwargs)
+        except Exception as e:
+            print(f"{RED}Background task failed: {e}{RESET}")
+            self._results.put((task, task.on_error, (e,)))
+            return
+        self._results.put((task, task.on_done, (result,)))
+
+    def drain(self):
+        # Called from the Tk thread so callbacks can touch widgets safely
+        while True:
+            try:
+                task, callback, args = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if callback is None or task.cancelled:
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"{RED}Task callback failed: {e}{RESET}")
+
+    def shutdown(self):
+        with self._lock:
+            parse_tasks = [task for task in self._pending if task.lane == LANE_PARSE]
+        for task in parse_tasks:
+            task.cancel()
+        self._lanes[LANE_PARSE].shutdown(wait=False)
+        # Let queued workbook writes finish so nothing is lost on exit
+        self._lanes[LANE_IO].shutdown(wait=True)
+
+_tasks = None
+_tasks_lock = threading.Lock()
+
+def get_task_queue():
+    global _tasks
+    with _tasks_lock:
+        if _tasks is None:
+            _tasks = TaskQueue()
+        return _tasks
+
+def shutdown_task_queue():
+    global _tasks
+    with _tasks_lock:
+        tasks = _tasks
+        _tasks = None
+    if tasks is not None:
+        tasks.shutdown()
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+from pathlib import Path
+import openpyxl
+import pytest
+from application_store import ApplicationStore, write_workbook
+from constants import HEADERS
+from journal import MutationJournal, journal_path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def make_row(title):
+    return ["2024-01-01", title, "Acme", "Remote", "", f"https://example.com/{title}"]
+
+def sheet_rows(path):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return [list(row) for row in wb.active.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "job_applications.xlsx"
+    write_workbook(path, [])
+    return str(path)
+
+def test_user_columns_stay_with_their_row_after_delete(tmp_path):
+    # A hand-made tracker with a notes column the user added after the known headers
+    path = str(tmp_path / "job_applications.xlsx")
+    wb = openpyxl.Workbook()
+    wb.active.append(HEADERS + ["Notes"])
+    for title in ["first", "second", "third"]:
+        wb.active.append(make_row(title) + [f"note for {title}"])
+    wb.save(path)
+
+    store = ApplicationStore(path, flush_delay=60)
+    ids = {values[1]: row_id for row_id, values in store.records()}
+    store.delete(ids["second"])
+    store.close()
+
+    header, *rows = sheet_rows(path)
+    notes = header.index("Notes")
+    assert [(row[1], row[notes]) for row in rows] == [("first", "note for first"), ("third", "note for third")]
+
+def test_journal_is_replayed_after_a_crash_before_flush(workbook):
+    # The child logs a row, then dies without saving or closing anything
+    script = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {str(ROOT)!r})\n"
+        "from application_store import ApplicationStore\n"
+        "from journal import MutationJournal, journal_path\n"
+        f"store = ApplicationStore({workbook!r}, flush_delay=60, journal=MutationJournal(journal_path({workbook!r})))\n"
+        f"store.append({make_row('unsaved')!r})\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+    assert len(sheet_rows(workbook)) == 1
+
+    journal = MutationJournal(journal_path(workbook))
+    store = ApplicationStore(workbook, flush_delay=60, journal=journal)
+    assert [values[1] for _, values in store.records()] == ["unsaved"]
+    store.close()
+
+    assert [row[1] for row in sheet_rows(workbook)[1:]] == ["unsaved"]
+    assert not journal.pending()
+
+def test_flush_merges_rows_saved_by_another_process(workbook):
+    reloaded = []
+    gui = ApplicationStore(workbook, flush_delay=60, journal=MutationJournal(journal_path(workbook)),
+                           on_reloaded=lambda: reloaded.append(True))
+    gui_id = gui.append(make_row("from gui"))
+
+    # Stands in for the command line saving to the same file before the window's write-behind fires
+    cli = ApplicationStore(workbook, flush_delay=60)
+    cli_id = cli.append(make_row("from cli"))
+    cli.close()
+
+    gui.flush()
+    assert reloaded
+    assert {row_id for row_id, _ in gui.records()} == {gui_id, cli_id}
+    gui.close()
+
+    assert sorted(row[1] for row in sheet_rows(workbook)[1:]) == ["from cli", "from gui"]
@@ -0,0 +1,28 @@
+from job_parser import parse_static
+
+def test_static_tier_parses_posting(fixtures_url):
+    info, sources = parse_static(f"{fixtures_url}/posting_static.html")
+    assert info == {
+        "Job Title": "Senior Engineer",
+        "Company": "Acme",
+        "Location": "New York, NY",
+        "Job/Req #": "R-100",
+    }
+    assert sources["Company"] == 'meta[property="og:site_name"]'
+    assert sources["Location"] == "span.job-location"
+
+def test_static_tier_leaves_missing_company_unknown(fixtures_url):
+    info, _ = parse_static(f"{fixtures_url}/posting_no_company.html")
+    assert info["Job Title"] == "Data Scientist"
+    assert info["Location"] == "Austin, TX"
+    assert info["Company"] == "Unknown"
+
+def test_profile_hit_that_fails_checks_falls_through(fixtures_url):
+    profile = {"Location": ["p.intro"], "Job Title": ["p.intro", "h1.posting-title"]}
+    info, sources = parse_static(f"{fixtures_url}/posting_static.html", profile)
+    assert info["Location"] == "New York, NY"
+    assert info["Job Title"] == "Senior Engineer"
+    assert sources["Job Title"] == "h1.posting-title"
+
+def test_missing_page_returns_no_info(fixtures_url):
+    assert parse_static(f"{fixtures_url}/missing.html") == (None, {})
@@ -0,0 +1,24 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from constants import TRACKING_PARAMS, TRACKING_PARAM_PREFIXES
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+def _keep_fragment(fragment):
+    # Single-page job boards route on the fragment (#/job/123, #!/job/123); plain anchors are dropped
+    return fragment.startswith(("/", "!"))
+
+def normalize_url(url):
+    # Same posting, same key: tracking params and anchors are dropped, scheme and host casefolded
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+    scheme = parts.scheme.casefold()
+    host = parts.netloc.casefold()
+    if (scheme, host.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        host = host.rsplit(":", 1)[0]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k))
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query),
+                       parts.fragment if _keep_fragment(parts.fragment) else ""))